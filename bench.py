@@ -0,0 +1,240 @@
+"""Benchmarks for the GameplayScene update and render hot paths.
+
+Each scenario sets up a scripted game state, then times GameplayScene.update
+and GameplayScene.render (onto an offscreen surface) separately for a number
+of frames. Results are written as JSON so runs can be diffed between commits:
+
+    python bench.py --out bench_results.json
+    python bench.py --compare bench_results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+from core.game import Game
+from core.input import Controller
+from entities.enemy import Enemy
+from scenes.gameplay import GameplayScene
+from systems.bullet_patterns import patterns
+from systems.color_system import RED, BLUE
+
+STRESS_PATTERNS = "./assets/patterns/stress.json"
+
+
+def _add_enemies(scene, count, patterns):
+    """Place already-spawned enemies on a grid across the top half of the arena"""
+    cols = int(math.ceil(math.sqrt(count * 2)))
+    for i in range(count):
+        pos = (60 + (i % cols) * (1080 / max(1, cols - 1)), 60 + (i // cols) * 40)
+        enemy = Enemy(pos, scene.player, RED, patterns[i % len(patterns)], 10 ** 6,
+                      spawn_delay=0, color_system=scene.color_system, bullet_speed=240,
+                      rng=scene.rng, manager=scene.timer_system.enemies_spawned)
+        enemy.is_spawning = False
+        enemy.speed = 0  # hold formation so the load stays constant
+
+
+def _add_bullets(scene, count):
+    rng = scene.rng
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        scene.bullets.spawn((rng.uniform(0, 1200), rng.uniform(0, 800)),
+                            (math.cos(angle), math.sin(angle)), rng.choice([RED, BLUE]),
+                            rng.uniform(60, 120), 14)
+
+
+def _burst(scene, count):
+    """Particles from `count` kills at once, as GameplayScene spawns them"""
+    rng = scene.rng
+    for _ in range(count):
+        pos = (rng.uniform(100, 1100), rng.uniform(100, 700))
+        scene.particles.burst(pos, RED, rng.randint(5, 10))
+        scene.color_particles.burst(pos, BLUE, 10)
+
+
+def setup_spiral_bullets(scene):
+    # spiral shooters plus a standing field of bullets
+    _add_enemies(scene, 40, [4])
+    _add_bullets(scene, 2000)
+
+
+def setup_many_enemies(scene):
+    _add_enemies(scene, 300, [0, 1, 2, 4])
+
+
+def setup_pattern_storm(scene):
+    # the dense data-driven patterns, many emitters at once
+    patterns.load(STRESS_PATTERNS)
+    ids = sorted(patterns.ids[name] for name in ("flower", "shotgun", "stream", "double_helix", "wall"))
+    _add_enemies(scene, 200, ids)
+
+
+def setup_particle_storm(scene):
+    _burst(scene, 100)
+
+
+def frame_particle_storm(scene, frame):
+    # a fresh wave of mass kills every half second
+    if frame % 30 == 0:
+        _burst(scene, 100)
+
+
+def setup_late_game(scene):
+    # the timer state ~3:40 into a run, with everything it spawns by then
+    timer = scene.timer_system
+    timer.elapsed_time = 220
+    for _ in range(60):
+        timer._spawn_enemy()
+    for enemy in timer.enemies_spawned:
+        enemy.is_spawning = False
+    _add_bullets(scene, 800)
+
+
+SCENARIOS = {
+    "spiral_bullets": (setup_spiral_bullets, None),
+    "many_enemies": (setup_many_enemies, None),
+    "pattern_storm": (setup_pattern_storm, None),
+    "particle_storm": (setup_particle_storm, frame_particle_storm),
+    "late_game": (setup_late_game, None),
+}
+
+
+def _alive(scene):
+    return {
+        "enemies": len(scene.enemy),
+        "bullets": scene.bullets.get_live_count(),
+        "player_bullets": scene.player_bullets.get_live_count(),
+        "particles": len(scene.particles),
+        "color_particles": len(scene.color_particles),
+    }
+
+
+def _percentiles(samples):
+    ms = np.array(samples) * 1000
+    return {"p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99)), "mean": float(ms.mean())}
+
+
+def _make_scene(game, name):
+    setup, per_frame = SCENARIOS[name]
+    scene = GameplayScene(game, seed=0)
+    game.scene = scene
+    # an invulnerable, motionless player that fires at the centre of the arena
+    scene.player.health = 10 ** 9
+    scene.controller.state.fire = True
+    scene.controller.state.mouse_pos = (600, 200)
+    setup(scene)
+    scene.enemy = scene.timer_system.get_enemies()
+    return scene, per_frame
+
+
+def run_scenario(game, name, frames, warmup):
+    surface = pygame.Surface(game.screen.get_size())
+    delta = game.fixed_delta
+
+    # timing pass
+    scene, per_frame = _make_scene(game, name)
+    update_times, render_times = [], []
+    for frame in range(warmup + frames):
+        if per_frame:
+            per_frame(scene, frame)
+        start = time.perf_counter()
+        scene.update(delta)
+        mid = time.perf_counter()
+        scene.render(surface, delta)
+        end = time.perf_counter()
+        if frame >= warmup:
+            update_times.append(mid - start)
+            render_times.append(end - mid)
+    alive = _alive(scene)
+
+    # allocation pass (tracemalloc distorts timings, so it runs separately)
+    scene, per_frame = _make_scene(game, name)
+    alloc_bytes, net_blocks = [], []
+    tracemalloc.start()
+    for frame in range(warmup + frames):
+        if per_frame:
+            per_frame(scene, frame)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        scene.update(delta)
+        scene.render(surface, delta)
+        _, peak = tracemalloc.get_traced_memory()
+        if frame >= warmup:
+            alloc_bytes.append(peak - base)
+            net_blocks.append(sys.getallocatedblocks() - blocks)
+    tracemalloc.stop()
+
+    return {
+        "frames": frames,
+        "update_ms": _percentiles(update_times),
+        "render_ms": _percentiles(render_times),
+        "alloc_per_frame": {"peak_bytes_mean": float(np.mean(alloc_bytes)),
+                            "peak_bytes_max": int(np.max(alloc_bytes)),
+                            "net_blocks_mean": float(np.mean(net_blocks))},
+        "alive": alive,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _compare(old, new):
+    for name, result in new["scenarios"].items():
+        before = old.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for key in ("update_ms", "render_ms"):
+            a, b = before[key]["p95"], result[key]["p95"]
+            change = (b - a) / a * 100 if a else 0.0
+            print(f"{name:16s} {key:10s} p95 {a:8.3f} -> {b:8.3f} ms ({change:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hue Shift hot path benchmarks")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios (default: all)")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", metavar="JSON", help="print p95 changes against an earlier result file")
+    parser.add_argument("--dirty-rects", action="store_true", help="render in dirty-rect mode")
+    args = parser.parse_args()
+
+    # read the baseline first: --out may well be the same file
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    game = Game(headless=True, controller=Controller(), seed=0, dirty_rects=args.dirty_rects)
+    results = {"commit": _git_commit(), "python": platform.python_version(),
+               "pygame": pygame.version.ver, "dirty_rects": args.dirty_rects, "scenarios": {}}
+    # gameplay code logs spawns and hits; keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in args.scenario or SCENARIOS:
+            results["scenarios"][name] = run_scenario(game, name, args.frames, args.warmup)
+
+    for name, result in results["scenarios"].items():
+        u, r = result["update_ms"], result["render_ms"]
+        print(f"{name:16s} update p50/p95/p99 {u['p50']:6.2f}/{u['p95']:6.2f}/{u['p99']:6.2f} ms   "
+              f"render {r['p50']:6.2f}/{r['p95']:6.2f}/{r['p99']:6.2f} ms   alive {result['alive']}")
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    if baseline is not None:
+        _compare(baseline, results)
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pygame
+
+
+class AssetManager:
+    def __init__(self):
+        """
+        Loads images once, keeps scaled variants keyed by size and can decode
+        them on a background thread ahead of time
+        """
+        # (path, size, alpha) -> converted surface, ready to blit
+        self.images = {}
+        # (path, size) -> decoded (and scaled) surface, not yet converted to the display format
+        self._decoded = {}
+        # (path, size) -> seconds spent decoding (size None) or scaling
+        self.load_times = {}
+        # (path, size) -> exception from a failed background load
+        self.errors = {}
+        # decoding happens under this lock, so a get during a preload waits for
+        # the file being loaded instead of loading it twice
+        self._lock = threading.RLock()
+        self._thread = None
+
+    def _decode(self, path, size):
+        key = (path, size)
+        with self._lock:
+            surf = self._decoded.get(key)
+            if surf is None:
+                # scaled variants are made from the decoded original (24/32-bit images)
+                original = self._decode(path, None) if size is not None else None
+                start = time.perf_counter()
+                if size is None:
+                    surf = pygame.image.load(path)
+                else:
+                    surf = pygame.transform.smoothscale(original, size)
+                self.load_times[key] = time.perf_counter() - start
+                self._decoded[key] = surf
+            return surf
+
+    def preload(self, specs):
+        """
+        Decode and scale images on a background thread
+        Arguments:
+            specs: Iterable of (path, size) pairs; size may be None
+        Conversion to the display format still happens on the first get_image,
+        on the main thread.
+        """
+        specs = [(path, tuple(size) if size is not None else None) for path, size in specs]
+
+        def work():
+            for path, size in specs:
+                try:
+                    self._decode(path, size)
+                except Exception as e:
+                    self.errors[(path, size)] = e
+
+        self._thread = threading.Thread(target=work, name="asset-preload", daemon=True)
+        self._thread.start()
+
+    def is_loading(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self):
+        """Block until a running preload has finished"""
+        if self._thread is not None:
+            self._thread.join()
+
+    def get_image(self, path, size=None, alpha=True):
+        """
+        Get an image, loading it now unless it was loaded (or preloaded) before
+        Arguments:
+            path: Image file path
+            size: (width, height) to smoothscale to, or None for the original size
+            alpha: Convert with per-pixel alpha (convert_alpha) rather than convert
+        The surface is shared, so callers must copy it before drawing on it.
+        Raises the pygame/OS error if the file can't be loaded.
+        """
+        size = tuple(size) if size is not None else None
+        key = (path, size, alpha)
+        image = self.images.get(key)
+        if image is None:
+            surf = self._decode(path, size)
+            image = surf.convert_alpha() if alpha else surf.convert()
+            self.images[key] = image
+        return image
+
+    def get_load_times(self):
+        """Milliseconds spent decoding each file ("path") and scaling each variant ("path@WxH")"""
+        report = {}
+        for (path, size), seconds in self.load_times.items():
+            name = path if size is None else f"{path}@{size[0]}x{size[1]}"
+            report[name] = seconds * 1000
+        return report
+
+
+# shared manager; Game starts the preload, scenes and entities get images from it
+assets = AssetManager()
+
+
+def load_image(path, size=None, alpha=True):
+    return assets.get_image(path, size, alpha)
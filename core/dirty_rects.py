@@ -0,0 +1,68 @@
+import pygame
+
+
+class DirtyRects:
+    def __init__(self, size, threshold=0.5, max_rects=256):
+        """
+        Tracks which parts of the screen changed between frames
+        Arguments:
+            size: Screen size
+            threshold: Fraction of the screen; when the dirty area is larger,
+                       the frame falls back to a full flip
+            max_rects: More rects than this also fall back, since many small
+                       blits and updates cost more than one full one
+        """
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.threshold = threshold
+        self.max_rects = max_rects
+        # rects drawn last frame; they still show old sprites until restored
+        self.previous = []
+        self.full = True
+
+    def invalidate(self):
+        """Redraw the whole screen next frame (e.g. after an overlay or scene change)"""
+        self.full = True
+
+    def restore(self, screen, background):
+        """
+        Put the background back where last frame drew, or everywhere after
+        an invalidate
+        Arguments:
+            screen: Surface being drawn to
+            background: Background Surface, or a color to fill with
+        """
+        if self.full:
+            rects = [self.screen_rect]
+        else:
+            rects = self.previous
+        if isinstance(background, pygame.Surface):
+            screen.blits([(background, rect, rect) for rect in rects], doreturn=False)
+        else:
+            for rect in rects:
+                screen.fill(background, rect)
+
+    def finish(self, rects):
+        """
+        Record the rects drawn this frame
+        Returns the rects to pass to pygame.display.update, or None if the
+        whole display should be flipped
+        """
+        screen_rect = self.screen_rect
+        if len(rects) > self.max_rects:
+            # too busy to be worth tracking; the next frame redraws everything
+            self.previous = []
+            self.full = True
+            return None
+        current = [screen_rect.clip(rect) for rect in rects]
+        current = [rect for rect in current if rect.w and rect.h]
+        changed = self.previous + current
+        self.previous = current
+        if self.full:
+            self.full = False
+            return None
+        if len(changed) > self.max_rects:
+            return None
+        area = sum(rect.w * rect.h for rect in changed)
+        if area > self.threshold * screen_rect.w * screen_rect.h:
+            return None
+        return changed
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+import pygame
+
+# (face, size) -> Font, loaded once per run
+_fonts = {}
+
+
+def get_font(size, face=None):
+    """
+    Get a font, loading it from disk only the first time it is asked for
+    Arguments:
+        size: Point size
+        face: Font file path, or None for pygame's default font
+    """
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        try:
+            font = pygame.font.Font(face, size)
+        except Exception:
+            font = pygame.font.SysFont("arial", size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    def __init__(self, max_size=256):
+        """
+        LRU cache of rendered text surfaces keyed by (font, string, color)
+        Arguments:
+            max_size: Number of surfaces kept before the least recently used is evicted
+        """
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font, text, color):
+        """Get the rendered surface, re-rendering only when the string or color is new"""
+        key = (font, text, tuple(color))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# shared cache used by the HUD and menus
+text_cache = TextCache()
+
+
+def render_text(size, text, color, face=None):
+    """Render text with a registry font through the shared cache.
+    The returned surface is shared, so don't modify it (copy first).
+    """
+    return text_cache.get(get_font(size, face), text, color)
@@ -1,21 +1,131 @@
+import os
+import random
+import time
 import pygame
+from core.assets import assets
+from core.gc_policy import GCPolicy
+from core.input import KeyboardMouseController
+from core.profiler import Profiler
 from scenes.main_menu import MainMenuScene
 from systems.color_system import ColorSystem
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, render=True, controller=None, fixed_delta=1 / 60, seed=None,
+                 dirty_rects=False, manage_gc=False):
+        """
+        Initialize the game
+        Arguments:
+            headless: Run without a window (dummy SDL video driver, no flip,
+                      no frame cap)
+            render: Whether scenes are rendered at all (headless runs may skip it)
+            controller: Player input source (default: keyboard and mouse)
+            fixed_delta: Simulation timestep in seconds
+            seed: Seed for the session; each run draws its own seed from it
+            dirty_rects: Let scenes that support it redraw and update only the
+                         parts of the screen that changed
+            manage_gc: Freeze each scene's long-lived objects and run garbage
+                       collection only in frames with time to spare
+        """
+        self.headless = headless
+        self.render_enabled = render
+        self.fixed_delta = fixed_delta
+        self.dirty_rects = dirty_rects
+        # longest frame fed into the accumulator, so a hitch can't cause a spiral of catch-up ticks
+        self.max_frame_time = 0.25
+        # how far (0-1) rendering is between the previous and the current tick
+        self.interpolation = 1.0
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        # callables run just before the game exits (e.g. saving a recording)
+        self.quit_hooks = []
+        # per-subsystem frame timings; off until enabled or its overlay is toggled (F3)
+        self.profiler = Profiler()
+        self.gc_policy = GCPolicy(budget=fixed_delta) if manage_gc else None
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         self.screen = pygame.display.set_mode((1200, 800))
         pygame.display.set_caption("Hue Shift")
         self.clock = pygame.time.Clock()
+        # images are loaded once per process; the menu starts preloading gameplay assets
+        self.assets = assets
+        self.controller = controller if controller is not None else KeyboardMouseController()
         # start at the main menu
         self.scene = MainMenuScene(self)
         self.color_system = ColorSystem()
 
-    def run(self):
-        while True:
-            delta = self.clock.tick(60) / 1000.0
-            self.scene.handle_events()
-            self.scene.update(delta)
-            self.scene.render(self.screen, delta)
-            pygame.display.flip()
+    def new_run_seed(self):
+        """Get the seed for a new gameplay run"""
+        return self.rng.randrange(2 ** 32)
+
+    def tick(self):
+        """Advance the current scene by one fixed simulation step"""
+        scene = self.scene
+        with self.profiler.section("events"):
+            scene.handle_events()
+        # a scene that was just switched to starts on the next tick, after it has polled input
+        if self.scene is scene:
+            scene.update(self.fixed_delta)
+
+    def scene_started(self):
+        """Called whenever a scene has just been built (including a restart in place)"""
+        if self.gc_policy:
+            self.gc_policy.scene_started()
+
+    def quit(self):
+        for hook in self.quit_hooks:
+            hook()
+        pygame.quit()
+        exit()
+
+    def run(self, max_frames=None):
+        frames = 0
+        accumulator = 0.0
+        profiler = self.profiler
+        gc_policy = self.gc_policy
+        if gc_policy:
+            gc_policy.start()
+        # the collector is handed back however the loop ends (max_frames or quit)
+        try:
+            scene = None
+            while max_frames is None or frames < max_frames:
+                if self.headless:
+                    # full speed; the clock only measures, it doesn't cap
+                    self.clock.tick()
+                    frame_time = self.fixed_delta
+                else:
+                    frame_time = min(self.clock.tick(60) / 1000.0, self.max_frame_time)
+                frame_start = time.perf_counter()
+                profiler.begin_frame()
+                if self.scene is not scene:
+                    scene = self.scene
+                    self.scene_started()
+                # simulate in fixed steps so frame hitches never change gameplay
+                accumulator += frame_time
+                while accumulator >= self.fixed_delta:
+                    self.tick()
+                    accumulator -= self.fixed_delta
+                self.interpolation = accumulator / self.fixed_delta
+                # scenes may return the rects they changed; None means the whole screen
+                rects = None
+                if self.render_enabled:
+                    rects = self.scene.render(self.screen, frame_time)
+                    if profiler.overlay:
+                        overlay_rect = profiler.render_overlay(self.screen)
+                        if rects is not None:
+                            rects.append(overlay_rect)
+                if not self.headless:
+                    with profiler.section("flip"):
+                        if rects is None:
+                            pygame.display.flip()
+                        else:
+                            pygame.display.update(rects)
+                if gc_policy:
+                    with profiler.section("gc"):
+                        gc_policy.end_frame(time.perf_counter() - frame_start)
+                profiler.end_frame()
+                frames += 1
+        finally:
+            if gc_policy:
+                gc_policy.stop()
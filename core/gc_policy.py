@@ -0,0 +1,85 @@
+import gc
+import sys
+
+
+class GCPolicy:
+    def __init__(self, budget=1 / 60, min_spare=0.003, gen1_every=10,
+                 max_young=20000, max_growth_blocks=500000):
+        """
+        Runs garbage collection when the game loop can afford it instead of
+        whenever the interpreter's allocation counters trip
+        Arguments:
+            budget: Frame budget in seconds
+            min_spare: Spare time a frame needs left over to run a young collection
+            gen1_every: Every this many young collections is a generation-1 one
+            max_young: Pending young-generation allocations that force a young
+                       collection even in a frame without spare time
+            max_growth_blocks: Growth in allocated blocks since the last full
+                               collection that forces a full one
+        """
+        self.budget = budget
+        self.min_spare = min_spare
+        self.gen1_every = gen1_every
+        self.max_young = max_young
+        self.max_growth_blocks = max_growth_blocks
+        self.active = False
+        self.baseline_blocks = 0
+        self.young_collections = 0
+        self.forced_young = 0
+        self.forced_full = 0
+        self.frozen = 0
+
+    def start(self):
+        """Take over from automatic collection"""
+        if not self.active:
+            gc.disable()
+            self.active = True
+        self.baseline_blocks = sys.getallocatedblocks()
+
+    def stop(self):
+        """Unfreeze everything and hand back to automatic collection"""
+        if self.active:
+            gc.unfreeze()
+            gc.enable()
+            self.active = False
+
+    def scene_started(self):
+        """
+        Call once a scene is built: everything alive now (assets, fonts, the
+        scene graph) is moved out of the collector's reach with gc.freeze
+        """
+        if not self.active:
+            return
+        # the previous scene's objects were frozen too; let them be collected
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        self.baseline_blocks = sys.getallocatedblocks()
+
+    def end_frame(self, elapsed):
+        """
+        Collect if this frame left time to spare or memory has grown too far
+        Arguments:
+            elapsed: Seconds the frame's work took (not counting the frame cap wait)
+        """
+        if not self.active:
+            return
+        if sys.getallocatedblocks() - self.baseline_blocks > self.max_growth_blocks:
+            gc.collect()
+            self.forced_full += 1
+            self.baseline_blocks = sys.getallocatedblocks()
+            return
+        pending = gc.get_count()[0]
+        if pending == 0:
+            return
+        if self.budget - elapsed >= self.min_spare:
+            self.young_collections += 1
+            gc.collect(1 if self.young_collections % self.gen1_every == 0 else 0)
+        elif pending > self.max_young:
+            gc.collect(0)
+            self.forced_young += 1
+
+    def get_stats(self):
+        return {"young_collections": self.young_collections, "forced_young": self.forced_young,
+                "forced_full": self.forced_full, "frozen": self.frozen}
@@ -0,0 +1,67 @@
+import argparse
+import time
+
+from core.game import Game
+from core.input import BotController
+from scenes.gameplay import GameplayScene
+from systems.bullet_patterns import load_patterns
+
+
+def simulate(seconds=251, controller=None, render=False, fixed_delta=1 / 60, seed=0, profile=False,
+             track_allocations=False, manage_gc=False):
+    """
+    Run a gameplay session headlessly at a fixed timestep and full speed
+    Arguments:
+        seconds: Simulated time to run for
+        controller: Player input source (default: BotController)
+        render: Also render every frame to the offscreen display surface
+        fixed_delta: Timestep in seconds
+        seed: Session seed; the same seed and input give the same run
+        profile: Record per-subsystem timings in game.profiler
+        track_allocations: Also record per-subsystem allocations and GC pauses
+        manage_gc: Run with the game's GC policy (see core.gc_policy)
+    Returns the game, with the finished GameplayScene as game.scene.
+    """
+    game = Game(headless=True, render=render,
+                controller=controller if controller is not None else BotController(),
+                fixed_delta=fixed_delta, seed=seed, manage_gc=manage_gc)
+    game.profiler.enabled = profile
+    game.profiler.track_allocations(track_allocations)
+    game.scene = GameplayScene(game)
+    game.run(max_frames=int(round(seconds / fixed_delta)))
+    return game
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless Hue Shift soak test")
+    parser.add_argument("--seconds", type=float, default=251)
+    parser.add_argument("--render", action="store_true", help="render to an offscreen surface too")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", metavar="PATH", help="write a per-subsystem timing trace (.json or .csv)")
+    parser.add_argument("--track-allocations", action="store_true",
+                        help="add per-subsystem allocations and GC pauses to the --profile trace")
+    parser.add_argument("--gc-policy", action="store_true", help="freeze the scene and schedule GC into spare frame time")
+    parser.add_argument("--patterns", metavar="PATH", action="append", default=[],
+                        help="load bullet patterns from a JSON file or directory (may repeat); "
+                             "patterns with spawn_after join the spawn table")
+    args = parser.parse_args()
+
+    for path in args.patterns:
+        load_patterns(path)
+
+    start = time.perf_counter()
+    game = simulate(args.seconds, render=args.render, seed=args.seed, profile=bool(args.profile),
+                    track_allocations=args.track_allocations, manage_gc=args.gc_policy)
+    wall = time.perf_counter() - start
+    scene = game.scene
+    print(f"simulated {args.seconds:.0f}s in {wall:.2f}s wall time")
+    print(f"score {scene.scoring_system.get_score()}, enemies {len(scene.enemy)}, "
+          f"bullets {scene.bullets.get_live_count()}, player bullets {scene.player_bullets.get_live_count()}")
+    if args.profile:
+        game.profiler.dump(args.profile)
+        frame = game.profiler.get_stats()["frame"]
+        print(f"frame p95 {frame['p95']:.2f} ms, p99 {frame['p99']:.2f} ms; trace written to {args.profile}")
+    if args.track_allocations:
+        game.profiler.print_alloc_stats()
+    if game.gc_policy:
+        print(f"gc policy: {game.gc_policy.get_stats()}")
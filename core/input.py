@@ -0,0 +1,76 @@
+import math
+import pygame
+
+
+class InputState:
+    def __init__(self):
+        """Player input for a single tick"""
+        self.move_x = 0  # -1 left, 1 right
+        self.move_y = 0  # -1 up, 1 down
+        self.mouse_pos = (0, 0)
+        self.fire = False
+        # one-shot presses, only true on the tick they happened
+        self.switch_color = False
+        self.restart = False
+        self.quit = False
+        # not gameplay input, so never recorded
+        self.toggle_profiler = False
+
+
+class Controller:
+    """Source of player input; poll is called once per tick by the scene"""
+    def __init__(self):
+        self.state = InputState()
+
+    def poll(self, events, scene=None):
+        return self.state
+
+
+class KeyboardMouseController(Controller):
+    """Reads the real keyboard and mouse"""
+    def poll(self, events, scene=None):
+        state = InputState()
+        keys = pygame.key.get_pressed()
+        state.move_x = keys[pygame.K_d] - keys[pygame.K_a]
+        state.move_y = keys[pygame.K_s] - keys[pygame.K_w]
+        state.mouse_pos = pygame.mouse.get_pos()
+        state.fire = pygame.mouse.get_pressed()[0]
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.quit = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    state.switch_color = True
+                if event.key == pygame.K_r:
+                    state.restart = True
+                if event.key == pygame.K_F3:
+                    state.toggle_profiler = True
+        self.state = state
+        return state
+
+
+class BotController(Controller):
+    """Scripted player for soak tests: strafes, fires at the nearest enemy
+    and switches color on a fixed period"""
+    def __init__(self, switch_every=180):
+        super().__init__()
+        self.tick = 0
+        self.switch_every = switch_every
+
+    def poll(self, events, scene=None):
+        state = InputState()
+        self.tick += 1
+        # strafe on a slow figure-of-eight
+        t = self.tick / 60
+        state.move_x = round(math.cos(t * 0.7))
+        state.move_y = round(math.sin(t * 1.4))
+        state.fire = True
+        state.mouse_pos = (600, 100)
+        if scene is not None and scene.enemy:
+            player = scene.player.pos
+            target = min(scene.enemy, key=lambda e: (e.pos - player).length_squared())
+            state.mouse_pos = (int(target.pos.x), int(target.pos.y))
+        state.switch_color = self.tick % self.switch_every == 0
+        state.restart = scene is not None and scene.player_dead
+        self.state = state
+        return state
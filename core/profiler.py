@@ -0,0 +1,308 @@
+import csv
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+import pygame
+
+from core.fonts import render_text
+
+# subsystems timed every frame, in the order they run
+SECTIONS = ("events", "player", "bullets", "collision", "enemies", "particles", "timer",
+            "entity_render", "hud_render", "flip", "gc")
+
+# 60 fps frame budget, in milliseconds
+BUDGET_MS = 1000 / 60
+
+
+class _Section:
+    """Context manager adding the wall time of its block to one section of the current frame"""
+    __slots__ = ("profiler", "index", "start")
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.current[self.index] += time.perf_counter() - self.start
+        return False
+
+
+class _AllocSection(_Section):
+    """Section that also attributes traced memory and net allocated blocks to itself"""
+    __slots__ = ("start_bytes", "start_blocks")
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.start_blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler.current[self.index] += elapsed
+        # peak growth counts temporaries freed again inside the section
+        profiler.current_bytes[self.index] += tracemalloc.get_traced_memory()[1] - self.start_bytes
+        profiler.current_blocks[self.index] += sys.getallocatedblocks() - self.start_blocks
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_section = _NullSection()
+
+
+class Profiler:
+    def __init__(self, history=300, max_trace=100000, sections=SECTIONS):
+        """
+        Per-subsystem frame timings with a rolling overlay graph
+        Arguments:
+            history: Frames kept for the graph and the percentiles
+            max_trace: Frames kept for dump (oldest are dropped first)
+            sections: Section names, in display order
+        """
+        self.enabled = False
+        self.overlay = False
+        self.sections = tuple(sections)
+        self._timers = {name: _Section(self, i) for i, name in enumerate(self.sections)}
+        # seconds per section for the frame in progress
+        self.current = [0.0] * len(self.sections)
+        self.frame = 0
+        self._frame_start = 0.0
+        # (frame, total, per-section seconds) for the last `history` frames and for dumping
+        self.history = deque(maxlen=history)
+        self.trace = deque(maxlen=max_trace)
+        self._panel = None
+        self._stats_lines = []
+        # allocation tracking mode (see track_allocations)
+        self.allocations = False
+        self.current_bytes = [0] * len(self.sections)
+        self.current_blocks = [0] * len(self.sections)
+        # (generation, seconds) of every collection during the frame in progress
+        self.current_gc = []
+        self._gc_start = 0.0
+        self._frame_blocks = 0
+        # (frame, per-section bytes, per-section blocks, frame net blocks, gc pauses, hitch)
+        self.alloc_trace = deque(maxlen=max_trace)
+        self.hitches = []
+        self.gen2_count = 0
+        self.gen2_max = 0.0
+
+    def section(self, name):
+        """with profiler.section("bullets"): ... -- a no-op while disabled"""
+        if not self.enabled:
+            return _null_section
+        return self._timers[name]
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = [0.0] * len(self.sections)
+        if self.allocations:
+            self.current_bytes = [0] * len(self.sections)
+            self.current_blocks = [0] * len(self.sections)
+            self.current_gc = []
+            self._frame_blocks = sys.getallocatedblocks()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._frame_start
+        record = (self.frame, total, tuple(self.current))
+        self.history.append(record)
+        self.trace.append(record)
+        if self.allocations:
+            # a frame over budget that ran a full collection is a GC hitch
+            hitch = total * 1000 > BUDGET_MS and any(gen == 2 for gen, _ in self.current_gc)
+            if hitch:
+                self.hitches.append(self.frame)
+            self.alloc_trace.append((self.frame, tuple(self.current_bytes), tuple(self.current_blocks),
+                                     sys.getallocatedblocks() - self._frame_blocks,
+                                     tuple(self.current_gc), hitch))
+        self.frame += 1
+
+    def track_allocations(self, on=True):
+        """
+        Turn allocation tracking on or off. While on, every section also records
+        the bytes it allocated (tracemalloc peak growth) and its net allocated
+        blocks, and every GC pause is recorded with its generation. Timings are
+        inflated by tracemalloc in this mode; compare them only with each other.
+        """
+        if on == self.allocations:
+            return
+        self.allocations = on
+        if on:
+            self.enabled = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            gc.callbacks.append(self._on_gc)
+            self._timers = {name: _AllocSection(self, i) for i, name in enumerate(self.sections)}
+        else:
+            gc.callbacks.remove(self._on_gc)
+            tracemalloc.stop()
+            self._timers = {name: _Section(self, i) for i, name in enumerate(self.sections)}
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            seconds = time.perf_counter() - self._gc_start
+            self.current_gc.append((info["generation"], seconds))
+            if info["generation"] == 2:
+                self.gen2_count += 1
+                self.gen2_max = max(self.gen2_max, seconds)
+
+    def get_alloc_stats(self):
+        """Mean bytes/blocks per frame for each section, GC pauses per generation and hitch frames"""
+        if not self.alloc_trace:
+            return {}
+        per_bytes = np.array([record[1] for record in self.alloc_trace])
+        per_blocks = np.array([record[2] for record in self.alloc_trace])
+        stats = {"sections": {name: {"bytes_mean": float(per_bytes[:, i].mean()),
+                                     "bytes_max": int(per_bytes[:, i].max()),
+                                     "blocks_mean": float(per_blocks[:, i].mean())}
+                              for i, name in enumerate(self.sections)},
+                 "frame_blocks_mean": float(np.mean([record[3] for record in self.alloc_trace]))}
+        pauses = {0: [], 1: [], 2: []}
+        for record in self.alloc_trace:
+            for gen, seconds in record[4]:
+                pauses[gen].append(seconds * 1000)
+        stats["gc"] = {f"gen{gen}": {"count": len(ms), "total_ms": float(sum(ms)),
+                                     "max_ms": float(max(ms, default=0.0))}
+                       for gen, ms in pauses.items()}
+        stats["hitch_frames"] = list(self.hitches)
+        return stats
+
+    def print_alloc_stats(self):
+        """Print the summary from get_alloc_stats, one line per section and GC generation"""
+        stats = self.get_alloc_stats()
+        if not stats:
+            print("no allocations recorded")
+            return
+        for name, s in stats["sections"].items():
+            print(f"{name:13s} {s['bytes_mean'] / 1024:8.1f} KB/frame  {s['blocks_mean']:+8.1f} blocks/frame")
+        for gen, s in stats["gc"].items():
+            print(f"{gen}: {s['count']} collections, {s['total_ms']:.1f} ms total, max {s['max_ms']:.2f} ms")
+        print(f"gen-2 hitch frames: {stats['hitch_frames']}")
+
+    def toggle_overlay(self):
+        """Show or hide the overlay; showing it also turns recording on"""
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.enabled = True
+
+    def get_stats(self):
+        """p50/p95/p99/max in ms over the history, for the whole frame and each section"""
+        if not self.history:
+            return {}
+        totals = np.array([record[1] for record in self.history]) * 1000
+        per_section = np.array([record[2] for record in self.history]) * 1000
+        stats = {"frame": _percentiles(totals)}
+        for i, name in enumerate(self.sections):
+            stats[name] = _percentiles(per_section[:, i])
+        return stats
+
+    def dump(self, path):
+        """Write the trace as JSON (path ending in .json) or CSV, in milliseconds"""
+        if path.endswith(".json"):
+            frames = [dict(frame=frame, total=total * 1000,
+                           **{name: t * 1000 for name, t in zip(self.sections, times)})
+                      for frame, total, times in self.trace]
+            data = {"sections": list(self.sections), "budget_ms": BUDGET_MS,
+                    "summary": self.get_stats(), "frames": frames}
+            if self.alloc_trace:
+                data["allocations"] = self.get_alloc_stats()
+                data["alloc_frames"] = [
+                    {"frame": frame, "bytes": dict(zip(self.sections, bytes_)),
+                     "blocks": dict(zip(self.sections, blocks)), "frame_blocks": frame_blocks,
+                     "gc": [{"generation": gen, "ms": seconds * 1000} for gen, seconds in pauses],
+                     "hitch": hitch}
+                    for frame, bytes_, blocks, frame_blocks, pauses, hitch in self.alloc_trace]
+            with open(path, "w") as f:
+                json.dump(data, f, indent=1)
+        else:
+            allocs = {record[0]: record for record in self.alloc_trace}
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                header = ["frame", "total"] + list(self.sections)
+                if allocs:
+                    header += [f"{name}_bytes" for name in self.sections]
+                    header += [f"{name}_blocks" for name in self.sections]
+                    header += ["frame_blocks", "gc_ms", "gc_gen2", "hitch"]
+                writer.writerow(header)
+                for frame, total, times in self.trace:
+                    row = [frame, f"{total * 1000:.3f}"] + [f"{t * 1000:.3f}" for t in times]
+                    record = allocs.get(frame)
+                    if record is not None:
+                        _, bytes_, blocks, frame_blocks, pauses, hitch = record
+                        row += list(bytes_) + list(blocks)
+                        row += [frame_blocks, f"{sum(s for _, s in pauses) * 1000:.3f}",
+                                sum(1 for gen, _ in pauses if gen == 2), int(hitch)]
+                    writer.writerow(row)
+
+    def render_overlay(self, screen, pos=(10, 50)):
+        """Draw the frame-time graph and timings; returns the Rect drawn to"""
+        # opaque, so drawing it over dirty-rect frames never accumulates
+        if self._panel is None:
+            self._panel = pygame.Surface((320, 330))
+        panel = self._panel
+        width, graph_h = panel.get_width(), 90
+        panel.fill((20, 20, 20))
+
+        # rolling frame-time graph, 0 to 2x budget, with the budget line
+        totals = [record[1] * 1000 for record in self.history]
+        scale = graph_h / (BUDGET_MS * 2)
+        budget_y = graph_h - int(BUDGET_MS * scale)
+        pygame.draw.line(panel, (255, 80, 80), (0, budget_y), (width, budget_y), 1)
+        if len(totals) > 1:
+            step = width / (self.history.maxlen - 1)
+            points = [(int(i * step), graph_h - int(min(ms, BUDGET_MS * 2) * scale))
+                      for i, ms in enumerate(totals)]
+            pygame.draw.lines(panel, (120, 255, 120), False, points, 1)
+
+        # text only changes a few times a second so it stays readable
+        if self.frame % 15 == 0 or not self._stats_lines:
+            stats = self.get_stats()
+            lines = []
+            if stats:
+                frame = stats["frame"]
+                lines.append(f"frame p95 {frame['p95']:.1f}  p99 {frame['p99']:.1f}  max {frame['max']:.1f} ms")
+                for name in self.sections:
+                    s = stats[name]
+                    lines.append(f"{name:13s} {s['p50']:5.2f} / {s['p95']:5.2f} ms")
+                if self.allocations and self.alloc_trace:
+                    _, bytes_, blocks, frame_blocks, _, _ = self.alloc_trace[-1]
+                    lines.append(f"alloc {sum(bytes_) / 1024:.0f} KB, net blocks {frame_blocks:+d}")
+                    lines.append(f"gen2 {self.gen2_count}x max {self.gen2_max * 1000:.1f} ms, "
+                                 f"hitches {len(self.hitches)}")
+            self._stats_lines = lines
+        y = graph_h + 4
+        for line in self._stats_lines:
+            panel.blit(render_text(18, line, (255, 255, 255)), (6, y))
+            y += 16
+        return screen.blit(panel, pos)
+
+
+def _percentiles(ms):
+    return {"p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99)), "max": float(ms.max())}
@@ -0,0 +1,68 @@
+# draw order, back to front
+LAYERS = ("player_bullets", "player", "enemy_bullets", "banners", "enemies", "particles", "hud")
+
+
+class RenderQueue:
+    def __init__(self, size, layers=LAYERS):
+        """
+        Collects (sprite, position) pairs per layer and flushes each layer with Surface.blits
+        Arguments:
+            size: Screen size; sprites entirely outside it are culled on submit
+            layers: Layer names in draw order
+        """
+        self.width, self.height = size
+        self.layers = {name: [] for name in layers}
+        self.submitted = 0
+        self.culled = 0
+
+    def submit(self, layer, surface, pos, area=None):
+        """Queue a blit of surface (or the area Rect of it) with its top-left corner at pos"""
+        x, y = pos[0], pos[1]
+        w, h = (area[2], area[3]) if area is not None else surface.get_size()
+        if x >= self.width or y >= self.height or x + w <= 0 or y + h <= 0:
+            self.culled += 1
+            return
+        self.submitted += 1
+        self.layers[layer].append((surface, pos) if area is None else (surface, pos, area))
+
+    def draw(self, layer, func):
+        """
+        Queue a callable func(screen) for things that aren't blits (lines, rects);
+        it should return the Rect (or list of Rects) it drew to so dirty-rect
+        rendering can track it
+        """
+        self.layers[layer].append(func)
+
+    def flush(self, screen, layers=None):
+        """
+        Draw every layer in order, one Surface.blits call per run of blits,
+        and empty the queue. Returns the rects of everything drawn.
+        Arguments:
+            screen: Surface to draw to
+            layers: Names of the layers to draw (still in draw order), or
+                    None for all of them; the others stay queued
+        """
+        rects = []
+        for name, items in self.layers.items():
+            if layers is not None and name not in layers:
+                continue
+            start = 0
+            for i, item in enumerate(items):
+                if callable(item):
+                    if start < i:
+                        rects.extend(screen.blits(items[start:i]))
+                    drawn = item(screen)
+                    if isinstance(drawn, list):
+                        rects.extend(drawn)
+                    elif drawn is not None:
+                        rects.append(drawn)
+                    start = i + 1
+            if start < len(items):
+                rects.extend(screen.blits(items[start:] if start else items))
+            items.clear()
+        return rects
+
+    def clear(self):
+        """Drop everything queued without drawing it"""
+        for items in self.layers.values():
+            items.clear()
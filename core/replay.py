@@ -0,0 +1,163 @@
+import argparse
+import struct
+import sys
+import time
+
+from core.game import Game
+from core.input import Controller, InputState
+from scenes.gameplay import GameplayScene
+
+# file layout (little endian):
+#   header: magic, version, run seed, fixed timestep, tick count
+#   ticks:  one flags byte plus mouse x/y per tick
+#   footer: final score, player health, player x/y, elapsed run time
+MAGIC = b"HSRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHIdI")
+TICK = struct.Struct("<Bhh")
+FOOTER = struct.Struct("<qiddd")
+
+LEFT, RIGHT, UP, DOWN, FIRE, SWITCH, RESTART = (1 << i for i in range(7))
+
+
+def encode_tick(state):
+    flags = ((LEFT if state.move_x < 0 else 0) | (RIGHT if state.move_x > 0 else 0) |
+             (UP if state.move_y < 0 else 0) | (DOWN if state.move_y > 0 else 0) |
+             (FIRE if state.fire else 0) | (SWITCH if state.switch_color else 0) |
+             (RESTART if state.restart else 0))
+    x = max(-32768, min(32767, int(state.mouse_pos[0])))
+    y = max(-32768, min(32767, int(state.mouse_pos[1])))
+    return flags, x, y
+
+
+def decode_tick(flags, x, y):
+    state = InputState()
+    state.move_x = bool(flags & RIGHT) - bool(flags & LEFT)
+    state.move_y = bool(flags & DOWN) - bool(flags & UP)
+    state.fire = bool(flags & FIRE)
+    state.switch_color = bool(flags & SWITCH)
+    state.restart = bool(flags & RESTART)
+    state.mouse_pos = (x, y)
+    return state
+
+
+class Recording:
+    def __init__(self, seed, fixed_delta, ticks=None, final=None):
+        """
+        A recorded run
+        Arguments:
+            seed: Seed of the GameplayScene the recording starts in
+            fixed_delta: Simulation timestep the run used
+            ticks: List of (flags, mouse x, mouse y) per tick
+            final: Dict with the final score, health, pos and elapsed time
+        """
+        self.seed = seed
+        self.fixed_delta = fixed_delta
+        self.ticks = ticks if ticks is not None else []
+        self.final = final
+
+    def save(self, path):
+        final = self.final
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.fixed_delta, len(self.ticks)))
+            f.write(b"".join(TICK.pack(*t) for t in self.ticks))
+            f.write(FOOTER.pack(final["score"], final["health"], final["pos"][0],
+                                final["pos"][1], final["elapsed"]))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, fixed_delta, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Hue Shift recording")
+        offset = HEADER.size
+        ticks = list(TICK.iter_unpack(data[offset:offset + count * TICK.size]))
+        score, health, x, y, elapsed = FOOTER.unpack_from(data, offset + count * TICK.size)
+        final = {"score": score, "health": health, "pos": (x, y), "elapsed": elapsed}
+        return cls(seed, fixed_delta, ticks, final)
+
+
+def final_state(scene):
+    """Snapshot of the values a replay is checked against"""
+    return {"score": int(scene.scoring_system.get_score()),
+            "health": int(scene.player.health),
+            "pos": (scene.player.pos.x, scene.player.pos.y),
+            "elapsed": scene.timer_system.elapsed_time}
+
+
+class RecordingController(Controller):
+    """Wraps another controller and records every polled tick"""
+    def __init__(self, inner, fixed_delta=1 / 60):
+        super().__init__()
+        self.inner = inner
+        self.fixed_delta = fixed_delta
+        self.recording = None
+        self.scene = None
+
+    def poll(self, events, scene=None):
+        self.state = self.inner.poll(events, scene)
+        if scene is not None:
+            # the recording starts at the first gameplay tick; restarts after
+            # that are seeded from the run itself so they replay too
+            if self.recording is None:
+                self.recording = Recording(scene.seed, self.fixed_delta)
+            self.scene = scene
+            self.recording.ticks.append(encode_tick(self.state))
+        return self.state
+
+    def save(self, path):
+        """Write the recording, with the current scene's state as the expected result"""
+        if self.recording is None:
+            return False
+        self.recording.final = final_state(self.scene)
+        self.recording.save(path)
+        return True
+
+
+class ReplayController(Controller):
+    """Feeds recorded ticks back in order"""
+    def __init__(self, recording):
+        super().__init__()
+        self.ticks = recording.ticks
+        self.index = 0
+
+    def poll(self, events, scene=None):
+        if self.index < len(self.ticks):
+            self.state = decode_tick(*self.ticks[self.index])
+            self.index += 1
+        else:
+            self.state = InputState()
+        return self.state
+
+
+def replay(recording, render=False):
+    """
+    Replay a recording headlessly
+    Returns (final state, list of fields that differ from the recording).
+    """
+    game = Game(headless=True, render=render, controller=ReplayController(recording),
+                fixed_delta=recording.fixed_delta)
+    game.scene = GameplayScene(game, seed=recording.seed)
+    game.run(max_frames=len(recording.ticks))
+    final = final_state(game.scene)
+    expected = recording.final or {}
+    mismatches = [key for key in expected if expected[key] != final[key]]
+    return final, mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a Hue Shift recording headlessly")
+    parser.add_argument("path")
+    parser.add_argument("--render", action="store_true", help="render to an offscreen surface too")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    start = time.perf_counter()
+    final, mismatches = replay(recording, render=args.render)
+    wall = time.perf_counter() - start
+    simulated = len(recording.ticks) * recording.fixed_delta
+    print(f"replayed {simulated:.0f}s ({len(recording.ticks)} ticks) in {wall:.2f}s wall time")
+    for key in mismatches:
+        print(f"MISMATCH {key}: recorded {recording.final[key]}, replayed {final[key]}")
+    sys.exit(1 if mismatches else 0)
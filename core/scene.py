@@ -1,5 +1,6 @@
 class Scene:
     def handle_events(self, events): pass
     def update(self, delta_time): pass
+    # may return the list of rects it changed; None means the whole screen
     def render(self, screen): pass
     
\ No newline at end of file
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    def __init__(self, max_size=512, alpha_step=16):
+        """
+        LRU cache of pre-rendered primitive sprites
+        Arguments:
+            max_size: Number of sprites kept before the least recently used is evicted
+            alpha_step: Alpha values are rounded to multiples of this to share sprites
+        """
+        self.max_size = max_size
+        self.alpha_step = alpha_step
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _alpha_bucket(self, alpha):
+        return min(255, int(round(alpha / self.alpha_step)) * self.alpha_step)
+
+    def get(self, shape, radius, color, alpha, width=0):
+        """
+        Get the sprite for a shape, rendering it on first use
+        Arguments:
+            shape: "circle" or "ring"
+            radius: Radius in pixels (rounded down to an int)
+            color: RGB color
+            alpha: Opacity 0-255 (bucketed by alpha_step)
+            width: Outline width, only used by rings
+        """
+        radius = int(radius)
+        key = (shape, radius, tuple(color[:3]), self._alpha_bucket(alpha), width)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = self._render(*key)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def _render(self, shape, radius, color, alpha, width):
+        if shape == "ring":
+            # outline needs one extra pixel on each side
+            surf = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (radius + 1, radius + 1), radius, width)
+        else:
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (radius, radius), radius)
+        return surf
+
+    def clear(self):
+        self.sprites.clear()
+
+    def get_stats(self):
+        """Get hit/miss/eviction counters and the current size"""
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self.sprites)}
+
+
+# shared cache used by every entity
+sprite_cache = SpriteCache()
+
+
+def circle(radius, color, alpha):
+    return sprite_cache.get("circle", radius, color, alpha)
+
+
+def ring(radius, color, alpha, width=2):
+    return sprite_cache.get("ring", radius, color, alpha, width=width)
+
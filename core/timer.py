@@ -1,18 +1,23 @@
 import random
 from entities.enemy import Enemy, ChameleonEnemy
+from systems.enemy_manager import EnemyManager
+from systems.bullet_patterns import spawnable_patterns
 
 
 class TimerSystem:
-    def __init__(self, player, color_system, scoring_system=None):
+    def __init__(self, player, color_system, scoring_system=None, rng=random):
         """
         Initialize the timer system
+        Arguments:
+            rng: Random source for spawns (the run's seeded RNG)
         """
         self.player = player
         self.color_system = color_system
         self.scoring_system = scoring_system
+        self.rng = rng
         self.total_time = 251  #4 minutes and 11 seconds
         self.elapsed_time = 0
-        self.enemies_spawned = []
+        self.enemies_spawned = EnemyManager()
         self.last_spawn_time = 0
         # spawn interval in seconds (longer makes game less hectic)
         self.spawn_interval = 1.0
@@ -58,35 +63,32 @@ class TimerSystem:
         spawn_delay = max(0.3, 0.8 - time_progress * 0.5)
         
         # Random spawn
-        x_pos = random.randint(100, 1100)
-        y_pos = random.randint(80, 150)
+        x_pos = self.rng.randint(100, 1100)
+        y_pos = self.rng.randint(80, 150)
         
-        color = random.choice([self.color_system.RED, self.color_system.BLUE])
+        color = self.rng.choice([self.color_system.RED, self.color_system.BLUE])
         print(f"Spawning enemy with HP {base_hp:.2f} (color {('RED' if color==self.color_system.RED else 'BLUE')})")
         
-        if time_progress < 0.25:
-            allowed_patterns = [0]  # Only basic
-        elif time_progress < 0.5:
-            allowed_patterns = [0, 1]  # Add cone shots
-        elif time_progress < 0.75:
-            allowed_patterns = [0, 1, 2]  # Add alternating pattern
-        else:
-            allowed_patterns = [0, 1, 2, 4]  # Add spiral pattern
+        # patterns unlock by their spawn_after (basic, then cone, alternating
+        # and spiral, plus any loaded from pattern files)
+        allowed_patterns = spawnable_patterns(time_progress)
         
-        pattern = random.choice(allowed_patterns)
+        pattern = self.rng.choice(allowed_patterns)
         chameleon_chance = min(0.5, time_progress * 0.5)  # Up to 50% chance
         
         # adjust hp if enemy color matches player at spawn
         hp = int(base_hp * (2 if color == self.player.color else 1))
         
-        if random.random() < chameleon_chance:
+        if self.rng.random() < chameleon_chance:
             enemy = ChameleonEnemy(
                 (x_pos, y_pos), 
                 self.player, 
                 self.color_system, 
                 pattern, 
                 hp,
-                spawn_delay=spawn_delay
+                spawn_delay=spawn_delay,
+                rng=self.rng,
+                manager=self.enemies_spawned
             )
         else:
             enemy = Enemy(
@@ -97,13 +99,13 @@ class TimerSystem:
                 hp,
                 spawn_delay=spawn_delay, 
                 color_system=self.color_system,
-                bullet_speed=int(bullet_speed)
+                bullet_speed=int(bullet_speed),
+                rng=self.rng,
+                manager=self.enemies_spawned
             )
         
         enemy.speed = speed
         enemy.bullet_speed = int(bullet_speed)
-        
-        self.enemies_spawned.append(enemy)
     
     
     def get_elapsed_time(self):
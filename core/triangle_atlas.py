@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import pygame
+
+# vertex angles relative to the facing direction, per triangle shape
+SHAPES = {
+    # equilateral death-particle triangle
+    "particle": (0.0, 2 * math.pi / 3, 4 * math.pi / 3),
+    # player bullet dart, pointing along its velocity
+    "dart": (0.0, 2.5, -2.5),
+}
+
+
+class TriangleAtlas:
+    def __init__(self, angle_steps=64, size_step=1, alpha_step=32):
+        """
+        Pre-rotated triangle sprites at quantized angles, sizes and colors
+        Arguments:
+            angle_steps: Number of rotations baked per sprite (more is smoother, uses more memory)
+            size_step: Sizes are rounded to multiples of this many pixels
+            alpha_step: Faded variants are baked for alphas rounded to multiples of this
+        """
+        self.angle_steps = angle_steps
+        self.size_step = size_step
+        self.alpha_step = alpha_step
+        self.sprites = {}
+
+    def configure(self, angle_steps=None, size_step=None, alpha_step=None):
+        """Change the resolution; already baked sprites are dropped"""
+        if angle_steps is not None:
+            self.angle_steps = angle_steps
+        if size_step is not None:
+            self.size_step = size_step
+        if alpha_step is not None:
+            self.alpha_step = alpha_step
+        self.sprites.clear()
+
+    def quantize_sizes(self, sizes):
+        """Round sizes (scalar or array) to the baked size steps"""
+        step = self.size_step
+        return np.maximum(1, np.rint(np.asarray(sizes) / step) * step).astype(int)
+
+    def angle_indices(self, angles):
+        """Map angles in radians (scalar or array) to rotation indices"""
+        steps = self.angle_steps
+        return np.rint(np.asarray(angles) * (steps / (2 * math.pi))).astype(int) % steps
+
+    def _bake(self, shape, size, color, index):
+        surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        base = index * 2 * math.pi / self.angle_steps
+        points = [(size + math.cos(base + a) * size, size + math.sin(base + a) * size)
+                  for a in SHAPES[shape]]
+        pygame.draw.polygon(surf, color, points)
+        return surf
+
+    def get(self, shape, size, color, index, alpha=255):
+        """Get the sprite for a quantized size, rotation index and alpha, baking it on first use"""
+        if alpha < 255:
+            alpha = min(255, int(round(alpha / self.alpha_step)) * self.alpha_step)
+        key = (shape, size, color, index, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if alpha < 255:
+                # faded variants are copies of the opaque sprite
+                sprite = self.get(shape, size, color, index).copy()
+                sprite.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            else:
+                sprite = self._bake(shape, size, color, index)
+            self.sprites[key] = sprite
+        return sprite
+
+    def prebake(self, shape, sizes, colors):
+        """Bake every rotation for the given sizes and colors up front"""
+        for size in set(self.quantize_sizes(sizes).tolist()):
+            for color in colors:
+                for index in range(self.angle_steps):
+                    self.get(shape, size, tuple(color), index)
+
+    def memory_bytes(self):
+        return sum(s.get_width() * s.get_height() * 4 for s in self.sprites.values())
+
+
+# shared atlas used by particles and player bullets
+triangle_atlas = TriangleAtlas()
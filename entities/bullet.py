@@ -1,20 +1,16 @@
-import pygame
+from core import sprite_cache
 
-class Bullet():
-    def __init__(self, pos, dir, color):
-        self.pos = pygame.Vector2(pos)
-        self.speed = 600
-        self.vel = pygame.Vector2(dir) * self.speed
-        self.color = color
-        self.radius = 14
-    
-    def update(self, delta):
-        self.pos += self.vel * delta
-        if abs(self.pos.x) > 1500 or abs(self.pos.y) > 1500:
-            del self
+BULLET_SPEED = 600
+BULLET_RADIUS = 14
 
-    def render(self, screen):
-        # Create a surface with the bullet 
-        bullet_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(bullet_surf, (*self.color, int(255 * 0.95)), (self.radius, self.radius), self.radius)
-        screen.blit(bullet_surf, (int(self.pos.x) - self.radius, int(self.pos.y) - self.radius))
\ No newline at end of file
+
+def render_bullets(queue, pool, rewind=0.0):
+    """Submit every live enemy bullet in the pool, rewound by rewind seconds"""
+    idx = pool.indices()
+    radii = pool.radius[idx].astype(int)
+    corners = (pool.render_positions(rewind)[idx].astype(int) - radii[:, None]).tolist()
+    radii = radii.tolist()
+    for k, i in enumerate(idx.tolist()):
+        # pre-rendered bullet sprite, shared by every bullet of this look
+        bullet_surf = sprite_cache.circle(radii[k], pool.color_at(i), int(255 * 0.95))
+        queue.submit("enemy_bullets", bullet_surf, corners[k])
\ No newline at end of file
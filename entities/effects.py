@@ -1,28 +1,20 @@
 import pygame
-import random
-import math
+from core import sprite_cache
+from core.fonts import render_text
 
-class ColorParticle:
-    def __init__(self, pos, color):
-        self.pos = pygame.Vector2(pos)
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(100, 200)
-        self.vel = pygame.Vector2(math.cos(angle), math.sin(angle)) * speed
-        self.color = color
-        self.lifetime = 0.5
-        self.radius = random.uniform(3, 6)
-    
-    def update(self, delta):
-        self.pos += self.vel * delta
-        self.lifetime -= delta
-    
-    def render(self, screen):
-        if self.lifetime <= 0:
-            return
-        alpha = int(255 * (self.lifetime / 0.5) * 0.95)
-        surf = pygame.Surface((self.radius*2, self.radius*2), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (*self.color, alpha), (int(self.radius), int(self.radius)), int(self.radius))
-        screen.blit(surf, (self.pos.x - self.radius, self.pos.y - self.radius))
+def render_color_particles(queue, particles):
+    """Submit every live color-switch particle in a ParticleSystem"""
+    n = particles.count
+    if n == 0:
+        return
+    alphas = particles.alphas().tolist()
+    radii = particles.size[:n].tolist()
+    colors = particles.color[:n].tolist()
+    corners = (particles.pos[:n] - particles.size[:n, None]).tolist()
+    palette = particles.palette
+    for i in range(n):
+        surf = sprite_cache.circle(radii[i], palette[colors[i]], alphas[i])
+        queue.submit("particles", surf, corners[i])
 
 class FloatingText:
     def __init__(self, pos, text, color):
@@ -31,17 +23,17 @@ class FloatingText:
         self.color = color
         self.lifetime = 1.0
         self.vel = pygame.Vector2(0, -50)  # move upward
-        self.font = pygame.font.Font(None, 24)
+        # render once; copy so set_alpha doesn't touch the shared cached surface
+        self.text_surf = render_text(24, text, color).copy()
     
     def update(self, delta):
         self.pos += self.vel * delta
         self.lifetime -= delta
     
-    def render(self, screen):
+    def render(self, queue):
         if self.lifetime <= 0:
             return
         alpha = int(255 * (self.lifetime / 1.0) * 0.95)
-        text_surf = self.font.render(self.text, True, self.color)
-        text_surf.set_alpha(alpha)
-        rect = text_surf.get_rect(center=(int(self.pos.x), int(self.pos.y)))
-        screen.blit(text_surf, rect)
\ No newline at end of file
+        self.text_surf.set_alpha(alpha)
+        rect = self.text_surf.get_rect(center=(int(self.pos.x), int(self.pos.y)))
+        queue.submit("particles", self.text_surf, rect)
\ No newline at end of file
@@ -1,111 +1,147 @@
 import random
 import pygame
 import math
-from entities.bullet import Bullet
+import numpy as np
+from core import sprite_cache
+from entities.bullet import BULLET_SPEED, BULLET_RADIUS
+from systems.enemy_manager import EnemyManager
+from systems.bullet_patterns import fire, get_pattern
 
 
-def spawn_bullet(pos, direction, color, speed=None):
-    """Spawn a bullet at the given position in the given direction.
+def spawn_bullet(pool, pos, direction, color, speed=None):
+    """Spawn a bullet into the pool at the given position in the given direction.
 
     The optional `speed` argument allows callers to reduce the bullet velocity
     for easier waves (new players).  When not provided the bullet will use
-    whatever default speed is defined in the Bullet class (600).
+    the default bullet speed (600).
     """
-    b = Bullet(pos, direction, color)
-    if speed is not None:
-        b.speed = speed
-        b.vel = pygame.Vector2(direction) * speed
-    return b
+    if speed is None:
+        speed = BULLET_SPEED
+    return pool.spawn(pos, direction, color, speed, BULLET_RADIUS)
+
+
+def _field(name, cast=float):
+    """Property reading and writing one field of the enemy's manager slot
+    (or of its own state while it is in no manager)"""
+    def get(self):
+        if self._manager is None:
+            return cast(self._state[name])
+        return cast(getattr(self._manager, name)[self._slot])
+
+    def set(self, value):
+        if self._manager is None:
+            self._state[name] = value
+        else:
+            getattr(self._manager, name)[self._slot] = value
+    return property(get, set)
 
 
 class Enemy:
+    speed = _field("speed")
+    radius = _field("radius", int)
+    pattern = _field("pattern", int)
+    shoot_timer = _field("shoot_timer")
+    shoot_interval = _field("shoot_interval")
+    angle_offset = _field("angle_offset")
+    spawn_timer = _field("spawn_timer")
+    spawn_delay = _field("spawn_delay")
+    is_spawning = _field("spawning", bool)
+    flash_timer = _field("flash_timer")
+    is_chameleon = _field("chameleon", bool)
+
     def __init__(self, pos, player, color, pattern=0, health=50,
-                 spawn_delay=0.5, color_system=None, bullet_speed=None):
+                 spawn_delay=0.5, color_system=None, bullet_speed=None, rng=random, manager=None):
         """
         Initialize enemy
         Arguments:
             pos: Starting position
             player: Player object to track for movement and targeting
-            pattern: Shooting pattern (0-4)
+            pattern: Shooting pattern id (see systems.bullet_patterns.PATTERNS)
             color: Enemy color
             health: Enemy health (default: 50)
             spawn_delay: Delay before enemy becomes active (default: 0.5 seconds)
             color_system: Color system for tracking game state
             bullet_speed: If provided, override the default bullet speed.  This
                 makes it easy to slow down projectiles on early waves.
+            rng: Random source for death bursts (the run's seeded RNG)
+            manager: EnemyManager to add the enemy to; without one it keeps
+                its state itself until it is appended to a manager
         """
         self.health = health
         self.max_health = health
-        self.pos = pygame.Vector2(pos)
         self.player = player
-        self.color = color
-        self.pattern = pattern
-        self.radius = 24
-        self.speed = 100
-        self.bullet_speed = bullet_speed  # may be None, meaning default
-        self.shoot_timer = 0
-        self.angle_offset = 0  # For rotating patterns
-        self.spawn_delay = spawn_delay
-        self.spawn_timer = 0
-        self.is_spawning = True
         self.color_system = color_system
-        # visual flash when hit
-        self.flash_timer = 0
+        self.rng = rng
         
-        # choose initial shoot interval based on pattern
-        # give enemies a little more breathing room by spacing out their shots
-        match pattern:
-            case 0:
-                self.shoot_interval = 1.0  # floating guys don't fire at all
-            case 1:
-                self.shoot_interval = 0.8  # cone shots
-            case 2:
-                self.shoot_interval = 0.6  # alternating pattern
-            case 3:
-                self.shoot_interval = 0.5  # rapid burst
-            case 4:
-                self.shoot_interval = 1.2  # spiral pattern
+        # the shoot interval and first shot delay come with the pattern
+        spec = get_pattern(pattern)
+        # position, timers and color live in an EnemyManager slot (or in
+        # _state while the enemy is in no manager); the attributes above
+        # read and write it. angle_offset drives rotating patterns and
+        # flash_timer the hit flash.
+        state = {name: 0 for name, _, _ in EnemyManager.FIELDS}
+        state.update(pos=(pos[0], pos[1]), speed=100, radius=24, pattern=pattern,
+                     shoot_interval=spec["interval"], shoot_timer=-spec["delay"],
+                     spawn_delay=spawn_delay, spawning=True, color=tuple(color),
+                     bullet_speed=BULLET_SPEED if bullet_speed is None else bullet_speed)
+        self._manager, self._slot, self._state = None, None, state
+        if manager is not None:
+            manager.add(self, **state)
+
+    _bullet_speed = _field("bullet_speed")
+
+    @property
+    def pos(self):
+        if self._manager is None:
+            return pygame.Vector2(*self._state["pos"])
+        return pygame.Vector2(*self._manager.pos[self._slot])
+
+    @pos.setter
+    def pos(self, value):
+        if self._manager is None:
+            self._state["pos"] = value[0], value[1]
+        else:
+            self._manager.pos[self._slot] = value[0], value[1]
+
+    @property
+    def bullet_speed(self):
+        return self._bullet_speed
+
+    @bullet_speed.setter
+    def bullet_speed(self, value):
+        self._bullet_speed = BULLET_SPEED if value is None else value
+
+    @property
+    def color(self):
+        if self._manager is None:
+            return self._state["color"]
+        return self._manager.color_at(self._slot)
+
+    @color.setter
+    def color(self, value):
+        if self._manager is None:
+            self._state["color"] = tuple(value)
+        else:
+            self._manager.color[self._slot] = self._manager.color_index(value)
     
     def set_color(self, color):
         self.color = color
     
     def update(self, delta):
-        # Handle spawn animation
-        if self.is_spawning:
-            self.spawn_timer += delta
-            if self.spawn_timer >= self.spawn_delay:
-                self.is_spawning = False
-                self.spawn_timer = 0
-            return  # Don't update position or shoot while spawning
-        
-        self.shoot_timer += delta
-        self.angle_offset += delta
+        """Update this enemy alone (it must be in a manager); scenes update all of them at once with EnemyManager.update"""
+        self._manager.update(delta, self.player, np.array([self._slot]))
         
-        # Move towards player, with a spiral effect for basic enemies
-        if self.player:
-            direction = self.player.pos - self.pos
-            if direction.length() > 0:
-                direction = direction.normalize()
-                # basic enemies (pattern 0) spiral inwards
-                if self.pattern == 0:
-                    # add a small perpendicular component that oscillates
-                    perp = pygame.Vector2(-direction.y, direction.x)
-                    spiral_strength = 0.5  # adjust for spiral tightness
-                    direction = (direction + perp * math.sin(self.angle_offset * 5) * spiral_strength).normalize()
-                self.pos += direction * self.speed * delta
-        # decrement flash timer
-        if self.flash_timer > 0:
-            self.flash_timer -= delta
-        
-    def take_damage(self, amount, death_color):
+    def take_damage(self, amount, death_color, pool):
+        """
+        Apply damage; returns the enemy if it died, otherwise None.
+        Death bullets are emitted into the given bullet pool.
+        """
         self.health -= amount * (3 if self.color != death_color else 1)
         print(f"Enemy health: {self.health}")
         # trigger flash when hit but not dead
         if self.health > 0:
             self.flash_timer = 0.2
-        bullets = []
-        if self.health > 0:
-            return None, bullets  # Alive, no bullets
+            return None  # Alive, no bullets
         
         # enemy is dead - if killed by matching color, shoot bullets toward player
         if self.color == death_color and self.player:
@@ -113,168 +149,87 @@ class Enemy:
             if direction.length() > 0:
                 direction = direction.normalize()
                 # spawn 2-3 bullets in a scattered pattern around player direction
-                num = random.randint(2, 3)
+                num = self.rng.randint(2, 3)
                 for i in range(num):
-                    angle = math.atan2(direction.y, direction.x) + random.uniform(-1.0, 1.0)
+                    angle = math.atan2(direction.y, direction.x) + self.rng.uniform(-1.0, 1.0)
                     dir_vec = pygame.Vector2(math.cos(angle), math.sin(angle))
-                    bullets.append(spawn_bullet(self.pos, dir_vec, self.color, self.bullet_speed))
+                    spawn_bullet(pool, self.pos, dir_vec, self.color, self.bullet_speed)
         
-        return self, bullets
-    
-    def get_bullets(self):
-        """Get bullets based on the current pattern"""
-        if self.is_spawning:
-            return []  # Don't shoot while spawning
-        # only shoot if player and enemy share color
-        if self.player and self.player.color != self.color:
-            return []
-        if self.shoot_timer >= self.shoot_interval:
-            self.shoot_timer = 0
-            bullets = []
-            
-            if self.pattern == 0:
-                #floating guys (no bullets)
-                bullets = []
-            elif self.pattern == 1:
-                bullets = self._pattern_cone()
-            elif self.pattern == 2:
-                bullets = self._pattern_alternating()
-            elif self.pattern == 3:
-                bullets = self._pattern_burst()
-            else:  # pattern == 4
-                bullets = self._pattern_spiral()
-            
-            return bullets
-        return []
-    
-    def _pattern_omnidirectional(self):
-        """Pattern 0: Shoot in 8 directions"""
-        bullets = []
-        for i in range(8):
-            angle = (2 * math.pi * i) / 8
-            direction = pygame.Vector2(math.cos(angle), math.sin(angle))
-            bullets.append(spawn_bullet(self.pos, direction, self.color, self.bullet_speed))
-        return bullets
-    
-    def _pattern_cone(self):
-        """Pattern 1: Shoot cone towards player"""
-        bullets = []
-        direction_to_player = self.player.pos - self.pos
-        if direction_to_player.length() > 0:
-            direction_to_player = direction_to_player.normalize()
-            base_angle = math.atan2(direction_to_player.y, direction_to_player.x)
-            
-            # 2 bullets in a slightly wider cone to reduce spam
-            for i in range(2):
-                offset = (i - 0.5) * 0.4  # Spread cone
-                angle = base_angle + offset
-                direction = pygame.Vector2(math.cos(angle), math.sin(angle))
-                bullets.append(spawn_bullet(self.pos, direction, self.color, self.bullet_speed))
-        return bullets
-    
-    def _pattern_alternating(self):
-        """Pattern 2: Alternating spread pattern"""
-        bullets = []
-        direction_to_player = self.player.pos - self.pos
-        if direction_to_player.length() > 0:
-            direction_to_player = direction_to_player.normalize()
-            base_angle = math.atan2(direction_to_player.y, direction_to_player.x)
-            
-            # 3 bullets with alternating spread
-            for i in range(3):
-                offset = (i - 1) * 0.5
-                angle = base_angle + offset
-                direction = pygame.Vector2(math.cos(angle), math.sin(angle))
-                bullets.append(spawn_bullet(self.pos, direction, self.color, self.bullet_speed))
-        return bullets
+        return self
     
-    def _pattern_burst(self):
-        """Pattern 3: Rapid burst directly at player"""
-        bullets = []
-        direction_to_player = self.player.pos - self.pos
-        if direction_to_player.length() > 0:
-            direction_to_player = direction_to_player.normalize()
-            # Single bullet, but fires very frequently due to low shoot_interval
-            bullets.append(spawn_bullet(self.pos, direction_to_player, self.color, self.bullet_speed))
-        return bullets
-    
-    def _pattern_spiral(self):
-        """Pattern 4: Spiral pattern that rotates"""
-        bullets = []
-        num_bullets = 4
-        for i in range(num_bullets):
-            angle = (2 * math.pi * i) / num_bullets + self.angle_offset * 2
-            direction = pygame.Vector2(math.cos(angle), math.sin(angle))
-            bullets.append(spawn_bullet(self.pos, direction, self.color, self.bullet_speed))
-        return bullets
-    
-    def render(self, screen):
-        if self.is_spawning:
-            # Draw spawn preview
-            # Pulsing effect based on spawn timer
-            pulse = self.spawn_timer / self.spawn_delay  # 0 to 1
-            preview_radius = int(self.radius * (0.5 + pulse * 0.5))
-            preview_alpha = int(120 * 0.95 * (1 - pulse))  # Fades in, 5% more transparent
-            
-            # Draw expanding circle outline
-            outline_surf = pygame.Surface((preview_radius * 2 + 2, preview_radius * 2 + 2), pygame.SRCALPHA)
-            pygame.draw.circle(outline_surf, (*self.color, int(242)), (preview_radius + 1, preview_radius + 1), preview_radius, 2)
-            screen.blit(outline_surf, (int(self.pos.x) - preview_radius - 1, int(self.pos.y) - preview_radius - 1))
-            
-            # Draw semi-transparent circle
-            s = pygame.Surface((preview_radius * 2, preview_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, preview_alpha), (preview_radius, preview_radius), preview_radius)
-            screen.blit(s, (int(self.pos.x) - preview_radius, int(self.pos.y) - preview_radius))
+    def get_bullets(self, pool):
+        """Emit this enemy's bullets into the pool if its pattern is due to fire (it must be in a manager)"""
+        fire(self._manager, pool, self.player, BULLET_RADIUS, np.array([self._slot]))
+
+
+def render_enemies(queue, enemies):
+    """Submit every enemy in an EnemyManager, in slot order"""
+    n = enemies.count
+    if n == 0:
+        return
+    xs = enemies.pos[:n, 0].astype(int).tolist()
+    ys = enemies.pos[:n, 1].astype(int).tolist()
+    radii = enemies.radius[:n].astype(int).tolist()
+    colors = enemies.color[:n].tolist()
+    spawning = enemies.spawning[:n].tolist()
+    flashing = (enemies.flash_timer[:n] > 0).tolist()
+    spawn_timer = enemies.spawn_timer[:n].tolist()
+    spawn_delay = enemies.spawn_delay[:n].tolist()
+    palette = enemies.palette
+    # fully spawned enemies are 5% transparent, and mostly invisible while flashing
+    alpha = int(255 * 0.95)
+    flash_alpha = int(alpha * 0.3)
+    for i in range(n):
+        color, radius, x, y = palette[colors[i]], radii[i], xs[i], ys[i]
+        if spawning[i]:
+            # expanding outline and a fading-in circle, pulsing with the spawn timer
+            pulse = spawn_timer[i] / spawn_delay[i]  # 0 to 1
+            preview_radius = int(radius * (0.5 + pulse * 0.5))
+            preview_alpha = int(120 * 0.95 * (1 - pulse))
+            queue.submit("enemies", sprite_cache.ring(preview_radius, color, 242, 2),
+                         (x - preview_radius - 1, y - preview_radius - 1))
+            queue.submit("enemies", sprite_cache.circle(preview_radius, color, preview_alpha),
+                         (x - preview_radius, y - preview_radius))
         else:
-            # Draw fully spawned enemy with 5% more transparency
-            # If flashing, make semi-transparent to simulate invisibility
-            alpha = int(255 * 0.95)
-            if self.flash_timer > 0:
-                alpha = int(alpha * 0.3)
-            enemy_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(enemy_surf, (*self.color, alpha), (self.radius, self.radius), self.radius)
-            screen.blit(enemy_surf, (int(self.pos.x) - self.radius, int(self.pos.y) - self.radius))
+            queue.submit("enemies", sprite_cache.circle(radius, color, flash_alpha if flashing[i] else alpha),
+                         (x - radius, y - radius))
+
 
 class ChameleonEnemy(Enemy):
     """Enemy that changes color to match the player's current color"""
     
-    def __init__(self, pos, player, color_system, pattern=0, health=50, spawn_delay=0.5, bullet_speed=None):
+    def __init__(self, pos, player, color_system, pattern=0, health=50, spawn_delay=0.5, bullet_speed=None, rng=random,
+                 manager=None):
         """
         Initialize chameleon enemy
         Arguments:
             pos: Starting position
             player: Player object to track for movement and targeting
             color_system: Color system for syncing with player color
-            pattern: Shooting pattern (0-4)
+            pattern: Shooting pattern id (see systems.bullet_patterns.PATTERNS)
             health: Enemy health (default: 50)
             spawn_delay: Delay before enemy becomes active (default: 0.5 seconds)
             bullet_speed: Optional override for projectile velocity
+            rng: Random source for death bursts (the run's seeded RNG)
+            manager: EnemyManager to add the enemy to (see Enemy)
         """
         # Initialize with a default starting color
         super().__init__(pos, player, color_system.current_color(), pattern, health,
-                         spawn_delay, color_system, bullet_speed)
+                         spawn_delay, color_system, bullet_speed, rng, manager)
+        # the manager syncs the color with the player's on every update
         self.is_chameleon = True
         # make sure the attribute is set in case we change it later
         if bullet_speed is not None:
             self.bullet_speed = bullet_speed
     
-    def update(self, delta):
-        """Update and sync color with player"""
-        # Update color to match player
-        self.color = self.player.color
-        
-        # Call parent update
-        super().update(delta)
-    
-    def take_damage(self, amount, death_color):
+    def take_damage(self, amount, death_color, pool):
         """Override take_damage for chameleon"""
         # Chameleon only takes reduced damage from non-matching colors (since it matches player)
         self.health -= amount * (1 if self.color == death_color else 0.5)
         print(f"Chameleon Enemy health: {self.health}")
         
-        bullets = []
         if self.health > 0:
-            return None, bullets  # Alive, no bullets
+            return None  # Alive, no bullets
         
         # Chameleon is dead - if killed by matching color, shoot toward player with larger fan
         if self.color == death_color and self.player:
@@ -282,10 +237,10 @@ class ChameleonEnemy(Enemy):
             if direction.length() > 0:
                 direction = direction.normalize()
                 # fewer bullets but more scatter
-                num = random.randint(2, 3)
+                num = self.rng.randint(2, 3)
                 for i in range(num):
-                    angle = math.atan2(direction.y, direction.x) + random.uniform(-1.5, 1.5)
+                    angle = math.atan2(direction.y, direction.x) + self.rng.uniform(-1.5, 1.5)
                     dir_vec = pygame.Vector2(math.cos(angle), math.sin(angle))
-                    bullets.append(spawn_bullet(self.pos, dir_vec, self.color, self.bullet_speed))
+                    spawn_bullet(pool, self.pos, dir_vec, self.color, self.bullet_speed)
         
-        return self, bullets
\ No newline at end of file
+        return self
\ No newline at end of file
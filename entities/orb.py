@@ -1,5 +1,6 @@
 import pygame
 import math
+from core import sprite_cache
 
 
 class Orb:
@@ -67,9 +68,7 @@ class Orb:
         # Draw glow effect
         if self.lifetime < 7.0:  # Glow only until near end
             glow_radius = int(self.radius * 1.5)
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*self.color, int(base_alpha // 3)), 
-                              (glow_radius, glow_radius), glow_radius)
+            glow_surface = sprite_cache.circle(glow_radius, self.color, int(base_alpha // 3))
             screen.blit(glow_surface, 
                        (int(self.pos.x) - glow_radius, 
                         int(self.pos.y - self.float_height) - glow_radius))
@@ -1,36 +1,20 @@
-import pygame
-import random
-import math
+from core.triangle_atlas import triangle_atlas
 
-class TriangleParticle:
-    def __init__(self, pos, color):
-        self.pos = pygame.Vector2(pos)
-        # velocity random direction
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(100, 200)
-        self.vel = pygame.Vector2(math.cos(angle), math.sin(angle)) * speed
-        self.angle = random.uniform(0, 2 * math.pi)
-        self.spin = random.uniform(-5, 5)
-        self.size = random.uniform(6, 12)
-        self.color = color
-        self.lifetime = 1.0  # seconds
-    
-    def update(self, delta):
-        self.pos += self.vel * delta
-        self.angle += self.spin * delta
-        self.lifetime -= delta
-    
-    def render(self, screen):
-        if self.lifetime <= 0:
-            return
-        # compute triangle points centered on pos
-        pts = []
-        for i in range(3):
-            a = self.angle + i * (2 * math.pi / 3)
-            x = self.pos.x + math.cos(a) * self.size
-            y = self.pos.y + math.sin(a) * self.size
-            pts.append((x, y))
-        alpha = int(255 * min(1, self.lifetime / 1.0) * 0.95)
-        surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        pygame.draw.polygon(surf, (*self.color, alpha), [(p[0]-self.pos.x+self.size, p[1]-self.pos.y+self.size) for p in pts])
-        screen.blit(surf, (self.pos.x - self.size, self.pos.y - self.size))
\ No newline at end of file
+
+def render_triangle_particles(queue, particles):
+    """Submit every live triangle particle in a ParticleSystem"""
+    n = particles.count
+    if n == 0:
+        return
+    # per-particle values are computed in one batch, the triangle itself is a
+    # pre-rotated atlas sprite with its fade baked in
+    sizes = triangle_atlas.quantize_sizes(particles.size[:n])
+    rotations = triangle_atlas.angle_indices(particles.angle[:n]).tolist()
+    alphas = particles.alphas().tolist()
+    colors = particles.color[:n].tolist()
+    corners = (particles.pos[:n] - sizes[:, None]).tolist()
+    sizes = sizes.tolist()
+    palette = particles.palette
+    for i in range(n):
+        surf = triangle_atlas.get("particle", sizes[i], palette[colors[i]], rotations[i], alphas[i])
+        queue.submit("particles", surf, corners[i])
\ No newline at end of file
@@ -3,16 +3,27 @@ from pygame import surface
 import systems.color_system
 import sys
 
-from entities.player_bullets import PlayerBullet
+from core.assets import load_image
+from core.input import Controller
+from entities.player_bullets import PLAYER_BULLET_SPEED, PLAYER_BULLET_RADIUS
 
-def shoot_player_bullet(pos, direction, color):
-    return PlayerBullet(pos, direction, color)
+# sprite files per (color, state), drawn in a 60x120 box (visual_radius 30, width : height = 1 : 2)
+SPRITE_PATHS = {(color, state): f"./assets/{color}_{state}.png"
+                for color in ("red", "blue") for state in ("idle", "walk")}
+SPRITE_SIZE = (60, 120)
+
+def shoot_player_bullet(pool, pos, direction, color):
+    return pool.spawn(pos, direction, color, PLAYER_BULLET_SPEED, PLAYER_BULLET_RADIUS)
 
 class Player:
-    def __init__(self, name, health):
+    def __init__(self, name, health, controller=None):
         self.name = name
+        # input source; the scene polls it once per tick
+        self.controller = controller if controller is not None else Controller()
         self.health = health
         self.pos = pygame.Vector2(400, 300)
+        # position at the previous tick, for render interpolation
+        self.prev_pos = pygame.Vector2(self.pos)
         self.color = systems.color_system.RED
         self.speed = 300
         self.direction = pygame.Vector2(0, 0)
@@ -28,18 +39,10 @@ class Player:
         self.player_sprites = {"red": {}, "blue": {}}
 
         try:
-            # load and scale sprites to player visual size
-            w, h = self.sprite_width, self.sprite_height
-            # red sprites
-            img = pygame.image.load("./assets/red_idle.png").convert_alpha()
-            self.player_sprites["red"]["idle"] = pygame.transform.smoothscale(img, (w, h))
-            img = pygame.image.load("./assets/red_walk.png").convert_alpha()
-            self.player_sprites["red"]["walk"] = pygame.transform.smoothscale(img, (w, h))
-            # blue sprites (optional)
-            img = pygame.image.load("./assets/blue_idle.png").convert_alpha()
-            self.player_sprites["blue"]["idle"] = pygame.transform.smoothscale(img, (w, h))
-            img = pygame.image.load("./assets/blue_walk.png").convert_alpha()
-            self.player_sprites["blue"]["walk"] = pygame.transform.smoothscale(img, (w, h))
+            # load and scale sprites to player visual size (shared between runs)
+            size = (self.sprite_width, self.sprite_height)
+            for (color_key, state), path in SPRITE_PATHS.items():
+                self.player_sprites[color_key][state] = load_image(path, size)
         except Exception as e:
             print(f"Cannot load player images - {e}")
             # Fall back to a simple surface so game can still run
@@ -53,11 +56,23 @@ class Player:
             self.player_sprites["blue"]["idle"] = surf
             self.player_sprites["blue"]["walk"] = surf
 
+        # every (color, state, facing left) variant, flipped and faded up front
+        self.sprite_variants = {}
+        for color_key, states in self.player_sprites.items():
+            for state, sprite in states.items():
+                for facing_left in (True, False):
+                    # flip sprite horizontally when facing right
+                    image = sprite.copy() if facing_left else pygame.transform.flip(sprite, True, False)
+                    # apply a small opacity (semi-transparent)
+                    image.set_alpha(int(255 * 0.95))
+                    self.sprite_variants[(color_key, state, facing_left)] = image
+        self.image = self.sprite_variants[("red", "idle", self.facing_left)]
+
     def update(self, delta_time):
         self.t += delta_time
-        keys = pygame.key.get_pressed()
-        direction = pygame.Vector2(keys[pygame.K_d] - keys[pygame.K_a],
-                                keys[pygame.K_s] - keys[pygame.K_w])
+        self.prev_pos.update(self.pos)
+        state = self.controller.state
+        direction = pygame.Vector2(state.move_x, state.move_y)
         if direction.length() > 0:
             direction.normalize_ip()
 
@@ -67,44 +82,28 @@ class Player:
         # update sprite based on movement and current color
         color_key = "red" if self.color == systems.color_system.RED else "blue"
         state = "walk" if moving else "idle"
-        # pick sprite if available, otherwise keep previous
-        if color_key in self.player_sprites and state in self.player_sprites[color_key]:
-            self.image = self.player_sprites[color_key][state].copy()
-            # flip sprite horizontally when changing direction
-            # only change facing when there's horizontal input
-            if direction.x != 0:
-                self.facing_left = True if direction.x < 0 else False
-            if not self.facing_left:
-                try:
-                    self.image = pygame.transform.flip(self.image, True, False)
-                except Exception:
-                    pass
-            # apply a small opacity (semi-transparent)
-            try:
-                self.image.set_alpha(int(255 * 0.95))
-            except Exception:
-                pass
+        # only change facing when there's horizontal input
+        if direction.x != 0:
+            self.facing_left = direction.x < 0
+        self.image = self.sprite_variants[(color_key, state, self.facing_left)]
     
-    def get_bullets(self):
+    def get_bullets(self, pool):
+        """Emit a player bullet into the pool when firing"""
         if self.t < 0.05:
-            return []
-        if not pygame.mouse.get_pressed()[0]:
-            return []
-        mouse_pos = pygame.mouse.get_pos()
+            return
+        state = self.controller.state
+        if not state.fire:
+            return
+        mouse_pos = state.mouse_pos
         direction = pygame.Vector2(mouse_pos) - self.pos
         if direction.length() > 0:
             direction = direction.normalize()
-        bullet = shoot_player_bullet(self.pos, direction, self.color)
+        shoot_player_bullet(pool, self.pos, direction, self.color)
         self.t = 0
-        return [bullet]
-
-    def render(self, screen):   
-        if not hasattr(self, 'image') or self.image is None:
-            w, h = self.sprite_width, self.sprite_height
-            self.image = pygame.Surface((w, h), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (200, 200, 300, 0), pygame.Rect(0, 0, w*2, h*2), border_radius=max(0, w//4))
-            self.image.set_alpha(int(255 * 0.95))
 
-        rect = self.image.get_rect(center=(int(self.pos.x), int(self.pos.y)))
+    def render(self, queue, alpha=1.0):
+        """Submit the player sprite, interpolated alpha of the way from the previous tick"""
+        pos = self.prev_pos.lerp(self.pos, alpha)
+        rect = self.image.get_rect(center=(int(pos.x), int(pos.y)))
         
-        screen.blit(self.image, rect)
\ No newline at end of file
+        queue.submit("player", self.image, rect)
\ No newline at end of file
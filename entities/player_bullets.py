@@ -1,26 +1,21 @@
-import pygame
-import math
+import numpy as np
+from core.triangle_atlas import triangle_atlas
 
-class PlayerBullet():
-    def __init__(self, pos, dir, color):
-        self.pos = pygame.Vector2(pos)
-        self.speed = 600
-        self.vel = pygame.Vector2(dir) * self.speed
-        self.color = color
-        self.radius = 20
-        self.bullet_speed = 3
-    
-    def update(self, delta):
-        self.pos += self.vel * delta * self.bullet_speed
-        if abs(self.pos.x) > 1500 or abs(self.pos.y) > 1500:
-            del self
+PLAYER_BULLET_SPEED = 600 * 3
+PLAYER_BULLET_RADIUS = 20
 
-    def render(self, screen):
-        # draw triangle pointing along velocity direction
-        angle = math.atan2(self.vel.y, self.vel.x)
-        points = [
-            (self.pos.x + math.cos(angle) * self.radius, self.pos.y + math.sin(angle) * self.radius),
-            (self.pos.x + math.cos(angle + 2.5) * self.radius, self.pos.y + math.sin(angle + 2.5) * self.radius),
-            (self.pos.x + math.cos(angle - 2.5) * self.radius, self.pos.y + math.sin(angle - 2.5) * self.radius),
-        ]
-        pygame.draw.polygon(screen, (*self.color, int(255 * 0.95)), points)
+
+def render_player_bullets(queue, pool, rewind=0.0):
+    """Submit every live player bullet in the pool, rewound by rewind seconds"""
+    idx = pool.indices()
+    if len(idx) == 0:
+        return
+    # dart pointing along velocity direction, looked up from the atlas
+    vel = pool.vel[idx]
+    rotations = triangle_atlas.angle_indices(np.arctan2(vel[:, 1], vel[:, 0])).tolist()
+    sizes = triangle_atlas.quantize_sizes(pool.radius[idx])
+    corners = (pool.render_positions(rewind)[idx] - sizes[:, None]).tolist()
+    sizes = sizes.tolist()
+    for k, i in enumerate(idx.tolist()):
+        surf = triangle_atlas.get("dart", sizes[k], pool.color_at(i), rotations[k])
+        queue.submit("player_bullets", surf, corners[k])
\ No newline at end of file
@@ -1,5 +1,48 @@
+import argparse
+
 from core.game import Game
+from core.input import KeyboardMouseController
+from core.replay import RecordingController
+from systems.bullet_patterns import load_patterns
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Hue Shift")
+    parser.add_argument("--seed", type=int, default=None, help="session seed")
+    parser.add_argument("--record", metavar="PATH", help="record the input of this session to PATH")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only redraw changed parts of the screen (faster on software rendering)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="record per-subsystem frame timings and write them to PATH (.json or .csv) on exit")
+    parser.add_argument("--track-allocations", action="store_true",
+                        help="also record per-subsystem allocations and GC pauses (slower); "
+                             "a summary is printed on exit")
+    parser.add_argument("--gc-policy", action="store_true",
+                        help="freeze long-lived objects and only collect garbage in frames with time to spare")
+    parser.add_argument("--asset-times", action="store_true", help="print how long each asset took to load on exit")
+    parser.add_argument("--patterns", metavar="PATH", action="append", default=[],
+                        help="load bullet patterns from a JSON file or directory (may repeat); "
+                             "patterns with spawn_after join the spawn table")
+    args = parser.parse_args()
+
+    for path in args.patterns:
+        load_patterns(path)
+
+    controller = None
+    if args.record:
+        controller = RecordingController(KeyboardMouseController())
+    game = Game(controller=controller, seed=args.seed, dirty_rects=args.dirty_rects,
+                manage_gc=args.gc_policy)
+    if args.record:
+        game.quit_hooks.append(lambda: controller.save(args.record))
+    if args.profile:
+        game.profiler.enabled = True
+        game.quit_hooks.append(lambda: game.profiler.dump(args.profile))
+    if args.track_allocations:
+        game.profiler.track_allocations()
+        game.quit_hooks.append(game.profiler.print_alloc_stats)
+    if args.asset_times:
+        def print_asset_times():
+            for name, ms in game.assets.get_load_times().items():
+                print(f"{ms:8.2f} ms  {name}")
+        game.quit_hooks.append(print_asset_times)
     game.run()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 import systems.color_system
 
@@ -7,11 +8,20 @@ class AimBar:
                  cross_x: int = 20, cross_size: int = 8):
         self.screen = screen
         self.player_pos = player_pos
+        self.mouse_pos = (0, 0)
         self.dash_len = dash_len
         self.gap_len = gap_len
         self.thickness = thickness
         self.cross_x = cross_x
         self.cross_size = cross_size
+        # one dash sprite, redrawn only when the aim direction or color
+        # changes, and the blits placing it along the line
+        self._dash = None
+        self._dash_start = (0, 0)
+        self._dash_key = None
+        self._line_key = None
+        self._line_blits = []
+        self._line_rects = []
 
         #Initial color 
         self._set_colors(systems.color_system.RED)
@@ -24,23 +34,17 @@ class AimBar:
         self.color = color
         self.color_transparent = (*color[:3], 80)  # same color, low alpha
 
-    def update(self, player_pos: list | tuple):
-        """Update the aim bar's tracked position (call each frame with current player pos)."""
+    def update(self, player_pos: list | tuple, mouse_pos: list | tuple):
+        """Update the aim bar's tracked positions (call each frame with current player and mouse pos)."""
         self.player_pos = player_pos
+        self.mouse_pos = mouse_pos
 
-    def render(self):
-        """Draw the dashed aim line and crosshair onto the screen."""
-        px, py = int(self.player_pos[0]), int(self.player_pos[1])
-        mx, my = pygame.mouse.get_pos()
-        screen_w, screen_h = self.screen.get_size()
-
+    def _layout(self, px, py, mx, my, screen_w, screen_h):
+        """Dash segments and the rects covering them, computed in one batch"""
         dx = mx - px
         dy = my - py
         length = (dx ** 2 + dy ** 2) ** 0.5
 
-        if length == 0:
-            return
-
         # Normalized direction
         nx, ny = dx / length, dy / length
 
@@ -55,27 +59,68 @@ class AimBar:
 
         max_t = max((t for t in ts if t > 0), default=length)
 
+        # a dash starts every dash+gap pixels along the line
+        period = self.dash_len + self.gap_len
+        starts = np.arange(0, max_t, period)
+        ends = np.minimum(starts + self.dash_len, max_t)
+        segments = np.stack([px + nx * starts, py + ny * starts,
+                             px + nx * ends, py + ny * ends], axis=1).astype(int)
+
+        # one rect per few dashes, so a diagonal line doesn't cover its whole bounding box
+        chunks = segments[::4].copy()
+        last = np.minimum(np.arange(len(chunks)) * 4 + 3, len(segments) - 1)
+        chunks[:, 2:] = segments[last, 2:]
+        pad = self.thickness
+        left = np.minimum(chunks[:, 0], chunks[:, 2]) - pad
+        top = np.minimum(chunks[:, 1], chunks[:, 3]) - pad
+        width = np.abs(chunks[:, 2] - chunks[:, 0]) + 1 + pad * 2
+        height = np.abs(chunks[:, 3] - chunks[:, 1]) + 1 + pad * 2
+        screen_rect = pygame.Rect(0, 0, screen_w, screen_h)
+        rects = [screen_rect.clip(rect) for rect in np.stack([left, top, width, height], axis=1).tolist()]
+        return segments.tolist(), [rect for rect in rects if rect.w and rect.h]
+
+    def _dash_sprite(self, dx, dy):
+        """Transparent sprite of one dash along (dx, dy), and where the dash starts on it"""
+        key = (dx, dy, self.color_transparent)
+        if key != self._dash_key:
+            pad = self.thickness
+            start = (pad + max(0, -dx), pad + max(0, -dy))
+            self._dash = pygame.Surface((abs(dx) + 1 + pad * 2, abs(dy) + 1 + pad * 2), pygame.SRCALPHA)
+            pygame.draw.line(self._dash, self.color_transparent, start,
+                             (start[0] + dx, start[1] + dy), self.thickness)
+            self._dash_start = start
+            self._dash_key = key
+        return self._dash, self._dash_start
+
+    def render(self, screen=None):
+        """Draw the dashed aim line and crosshair onto the screen (default: the one given at init).
+        Returns the Rects covering what was drawn."""
+        screen = screen if screen is not None else self.screen
+        px, py = int(self.player_pos[0]), int(self.player_pos[1])
+        mx, my = int(self.mouse_pos[0]), int(self.mouse_pos[1])
+        screen_w, screen_h = screen.get_size()
+
+        if px == mx and py == my:
+            return None
+
         # --- Dashed line from player to screen edge ---
-        line_surface = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-
-        current_t = 0
-        drawing = True
-        while current_t < max_t:
-            seg = self.dash_len if drawing else self.gap_len
-            end_t = min(current_t + seg, max_t)
-            if drawing:
-                x1 = int(px + nx * current_t)
-                y1 = int(py + ny * current_t)
-                x2 = int(px + nx * end_t)
-                y2 = int(py + ny * end_t)
-                pygame.draw.line(line_surface, self.color_transparent, (x1, y1), (x2, y2), self.thickness)
-            current_t += seg
-            drawing = not drawing
-
-        self.screen.blit(line_surface, (0, 0))
+        # every dash is the same sprite; the line is only laid out again when
+        # it moves. The last dash may overshoot the edge, off screen.
+        key = (px, py, mx, my, self.color_transparent, screen_w, screen_h)
+        if key != self._line_key:
+            segments, self._line_rects = self._layout(px, py, mx, my, screen_w, screen_h)
+            length = ((mx - px) ** 2 + (my - py) ** 2) ** 0.5
+            dash, (sx, sy) = self._dash_sprite(round((mx - px) / length * self.dash_len),
+                                               round((my - py) / length * self.dash_len))
+            self._line_blits = [(dash, (x1 - sx, y1 - sy)) for x1, y1, _, _ in segments]
+            self._line_key = key
+        screen.blits(self._line_blits, doreturn=False)
 
         # --- Thick crosshair at mouse position ---
         cs = self.cross_size
         cross_thickness = max(2, self.thickness + 1)
-        pygame.draw.line(self.screen, self.color, (mx - cs, my), (mx + cs, my), cross_thickness)
-        pygame.draw.line(self.screen, self.color, (mx, my - cs), (mx, my + cs), cross_thickness)
\ No newline at end of file
+        pygame.draw.line(screen, self.color, (mx - cs, my), (mx + cs, my), cross_thickness)
+        pygame.draw.line(screen, self.color, (mx, my - cs), (mx, my + cs), cross_thickness)
+
+        cross_rect = pygame.Rect(mx - cs, my - cs, cs * 2 + 1, cs * 2 + 1)
+        return [cross_rect.inflate(cross_thickness * 2, cross_thickness * 2)] + self._line_rects
@@ -1,9 +1,18 @@
 import pygame
 import systems.color_system
+from core.fonts import get_font, text_cache
+
+# rotated, faded banner sprites keyed by (text, color); there are only a few
+_banners = {}
+
+def prebake_banners(colors):
+    """Render the rotated banner for each color up front"""
+    for color in colors:
+        ColorText(0, color).get_surface()
 
 class ColorText():
     def __init__(self, index, color):
-        self.font = pygame.font.Font(None, 108)
+        self.font = get_font(108)
         self.color = color
         self.text = '/ RED /' if color == systems.color_system.COLORS[0] else '/ BLUE /'
         self.text_bound = 25 * len(self.text)
@@ -21,10 +30,19 @@ class ColorText():
             self.pos = pygame.Vector2(-self.text_bound * 2, self.text_bound * 2) 
         self.pos += pygame.Vector2(self.text_speed, -self.text_speed) * delta
 
-    def render(self, screen):
-        text_surface = self.font.render(self.text, True, self.color)
-        # Apply 95% opacity
-        text_surface.set_alpha(int(255 * 0.95))
-        angled_text = pygame.transform.rotate(text_surface, 45)
+    def get_surface(self):
+        """The rotated banner sprite, rendered once per text and color"""
+        key = (self.text, self.color)
+        angled_text = _banners.get(key)
+        if angled_text is None:
+            text_surface = text_cache.get(self.font, self.text, self.color)
+            angled_text = pygame.transform.rotate(text_surface, 45)
+            # Apply 95% opacity (to the rotated copy, the cached text is shared)
+            angled_text.set_alpha(int(255 * 0.95))
+            _banners[key] = angled_text
+        return angled_text
+
+    def render(self, queue):
+        angled_text = self.get_surface()
         rect = angled_text.get_rect(center=self.pos + self.centre_pos)
-        screen.blit(angled_text, rect)
+        queue.submit("banners", angled_text, rect)
@@ -4,80 +4,111 @@ import random
 
 from core.scene import Scene
 from core.timer import TimerSystem
-from entities.player import Player
-from entities.bullet import Bullet
-from entities.enemy import Enemy
+from core.fonts import render_text
+from core.render_queue import RenderQueue, LAYERS
+from core.dirty_rects import DirtyRects
+from core.triangle_atlas import triangle_atlas
+from entities.player import Player, SPRITE_PATHS, SPRITE_SIZE
+from entities.bullet import render_bullets, BULLET_RADIUS
+from entities.player_bullets import render_player_bullets, PLAYER_BULLET_RADIUS
+from entities.enemy import render_enemies
 
-from entities.particle import TriangleParticle
-from entities.effects import ColorParticle, FloatingText
-from systems.color_system import ColorSystem
+from entities.particle import render_triangle_particles
+from entities.effects import render_color_particles, FloatingText
+from systems.color_system import ColorSystem, COLORS
 from systems.collision_system import CollisionSystem
+from systems.bullet_pool import BulletPool
+from systems.bullet_patterns import fire
+from systems.particle_system import ParticleSystem
 from systems.power_bar import PowerBar
+from systems.hud import HudCompositor
 from systems.scoring_system import ScoringSystem
-from misc.color_text import ColorText
+from misc.color_text import ColorText, prebake_banners
 from misc.aim_bar import AimBar
 
+BACKGROUND_PATH = "./assets/background.png"
+# render queue layers drawn under entity_render; the hud layer is timed as hud_render
+ENTITY_LAYERS = tuple(layer for layer in LAYERS if layer != "hud")
+
+
+def get_preload_assets(screen_size):
+    """(path, size) of every image the scene loads, for AssetManager.preload"""
+    return [(BACKGROUND_PATH, screen_size)] + [(path, SPRITE_SIZE) for path in SPRITE_PATHS.values()]
+
+
 class GameplayScene(Scene):
-    def __init__(self, game):
+    def __init__(self, game, seed=None):
         self.game = game
-        self.player = Player("Goat", 1)
+        # every run gets its own seeded RNG so a seed plus the input replays it exactly
+        self.seed = seed if seed is not None else game.new_run_seed()
+        self.rng = random.Random(self.seed)
+        self.controller = game.controller
+        self.player = Player("Goat", 1, self.controller)
         self.color_system = ColorSystem()
-        # Load background if available
+        # Load background if available (scaled to the screen; shared between runs)
         try:
-            self.background = pygame.image.load("./assets/background.png").convert()
+            self.background_scaled = self.game.assets.get_image(BACKGROUND_PATH, self.game.screen.get_size(), alpha=False)
         except Exception:
-            self.background = None
+            self.background_scaled = None
         current_color = self.color_system.current_color()
         self.color_texts = [ColorText(i, current_color) for i in range(4)]
         self.collision_system = CollisionSystem()
-        self.bullets = []
-        self.player_bullets = []
+        # bullets are culled once they leave the screen plus a small margin
+        screen_w, screen_h = self.game.screen.get_size()
+        arena = (-100, -100, screen_w + 100, screen_h + 100)
+        self.bullets = BulletPool(bounds=arena)
+        self.player_bullets = BulletPool(bounds=arena)
         self.power = 1
         self.player_base_damage = 1
         # let timer system know base damage estimate
         self.player.base_damage = self.player_base_damage
         self.power_bar = PowerBar()
         self.scoring_system = ScoringSystem()
-        self.timer_system = TimerSystem(self.player, self.color_system)
-        self.enemy = []
-        self.particles = []
-        self.color_particles = []
+        self.timer_system = TimerSystem(self.player, self.color_system, rng=self.rng)
+        self.enemy = self.timer_system.get_enemies()
+        # death triangles and color switch sparks
+        self.particles = ParticleSystem(1.0, size_range=(6, 12), spin_range=(-5, 5),
+                                        seed=self.rng.randrange(2 ** 32))
+        self.color_particles = ParticleSystem(0.5, size_range=(3, 6),
+                                              seed=self.rng.randrange(2 ** 32))
+        # bake every rotation of the triangle sprites up front (a no-op after the first run)
+        triangle_atlas.prebake("dart", [PLAYER_BULLET_RADIUS], COLORS)
+        triangle_atlas.prebake("particle", range(6, 13), COLORS)
+        prebake_banners(COLORS)
         self.floating_texts = []
         self.player_dead = False
-        if self.background:
-            try:
-                size = self.game.screen.get_size()
-                self.background_scaled = pygame.transform.smoothscale(self.background, size)
-            except Exception:
-                self.background_scaled = self.background
-        else:
-            self.background_scaled = None
         self.aim_bar = AimBar(self.game.screen, self.player.pos)
+        self.render_queue = RenderQueue(self.game.screen.get_size())
+        self.hud = HudCompositor(self.game.screen.get_size())
+        self.dirty_rects = DirtyRects(self.game.screen.get_size()) if self.game.dirty_rects else None
 
     def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN:
-                # Allow restart when dead
-                if self.player_dead and event.key == pygame.K_r:
-                    self.__init__(self.game)
-                    return
-                if event.key == pygame.K_SPACE:
-                    # color switch effect
-                    self.color_system.switch()
-                    self.color_texts = []
-                    self.power_bar.change_color(self.color_system.current_color())
-                    new_color = self.color_system.current_color()
-                    # spawn particles around player
-                    for _ in range(20):
-                        self.color_particles.append(ColorParticle(self.player.pos, new_color))
-                    # floating text of color name
-                    name = "Red" if new_color == self.color_system.RED else "Blue"
-                    # offset text slightly to the right of player
-                    self.floating_texts.append(FloatingText(self.player.pos + pygame.Vector2(20,0), name, new_color))
-                    self.aim_bar.set_color(new_color)
+        state = self.controller.poll(pygame.event.get(), self)
+        if state.quit:
+            self.game.quit()
+        if state.toggle_profiler:
+            self.game.profiler.toggle_overlay()
+            # the overlay isn't tracked, so whatever it covered needs a full redraw
+            if self.dirty_rects:
+                self.dirty_rects.invalidate()
+        # Allow restart when dead; the next run is seeded from this one so replays stay exact
+        if self.player_dead and state.restart:
+            self.__init__(self.game, seed=self.rng.randrange(2 ** 32))
+            self.game.scene_started()
+            return
+        if state.switch_color:
+            # color switch effect
+            self.color_system.switch()
+            self.color_texts = []
+            self.power_bar.change_color(self.color_system.current_color())
+            new_color = self.color_system.current_color()
+            # spawn particles around player
+            self.color_particles.burst(self.player.pos, new_color, 20)
+            # floating text of color name
+            name = "Red" if new_color == self.color_system.RED else "Blue"
+            # offset text slightly to the right of player
+            self.floating_texts.append(FloatingText(self.player.pos + pygame.Vector2(20,0), name, new_color))
+            self.aim_bar.set_color(new_color)
 
     def update(self, delta_time):
         if self.player_dead:
@@ -85,152 +116,168 @@ class GameplayScene(Scene):
         # if time has expired, stop further gameplay updates
         if self.timer_system.is_time_up():
             return
-        self.player.color = self.color_system.current_color()
-        self.player.update(delta_time)
+        profiler = self.game.profiler
+        with profiler.section("player"):
+            self.player.color = self.color_system.current_color()
+            self.player.update(delta_time)
         if not self.color_texts:
             current_color = self.color_system.current_color()
             self.color_texts = [ColorText(i, current_color) for i in range(4)]
         for text in self.color_texts:
             text.update(delta_time) 
-        for bullet in self.bullets:
-            bullet.update(delta_time)
-            if not self.collision_system.circle_hit(self.player, bullet):
-                continue
-            elif self.player.color == bullet.color:
-                self.power_bar.add_power()
-            else:
-                self.player.health -= 25
-                if self.player.health <= 0:
-                    self.player_dead = True
-            if bullet in self.bullets:
-                self.bullets.remove(bullet)
-        for bullet in self.player_bullets:
-            bullet.update(delta_time)
-            for enemy in self.enemy:
-                if self.collision_system.circle_hit(enemy, bullet):
-                    # Increase extend time bonus for opposite color hits
-                    time_bonus = 0.4 if enemy.color != self.player.color else 0.15
-                    self.scoring_system.extend_time(time_bonus)
-                    dead_enemy, bullets = enemy.take_damage(self.player_base_damage * self.power_bar.get_power_multiplier(), self.player.color)
-                    if dead_enemy:
-                        self.enemy.remove(dead_enemy)
-                        self.bullets.extend(bullets)
-                        for _ in range(random.randint(5, 10)):
-                            self.particles.append(TriangleParticle(dead_enemy.pos, dead_enemy.color))
-                        self.scoring_system.add_kill(base_score=100, enemy_hp=dead_enemy.max_health)
-                    if bullet in self.player_bullets:
-                        self.player_bullets.remove(bullet)
+        with profiler.section("bullets"):
+            self.bullets.update(delta_time)
+            self.player_bullets.update(delta_time)
+        with profiler.section("collision"):
+            # broad phase is rebuilt once per frame after bullets have moved
+            self.collision_system.rebuild(self.enemy, self.bullets)
+            for i in self.collision_system.bullets_hitting(self.player.pos, self.player.radius):
+                if self.player.color == self.bullets.color_at(i):
+                    self.power_bar.add_power()
+                else:
+                    self.player.health -= 25
+                    if self.player.health <= 0:
+                        self.player_dead = True
+                self.bullets.kill(i)
+            dead_enemies = set()
+            for i, enemy in self.collision_system.bullet_enemy_pairs(self.player_bullets):
+                # each bullet hits at most one enemy, and dead enemies take no more hits
+                if not self.player_bullets.alive[i] or enemy in dead_enemies:
+                    continue
+                self.player_bullets.kill(i)
+                # Increase extend time bonus for opposite color hits
+                time_bonus = 0.4 if enemy.color != self.player.color else 0.15
+                self.scoring_system.extend_time(time_bonus)
+                dead_enemy = enemy.take_damage(self.player_base_damage * self.power_bar.get_power_multiplier(), self.player.color, self.bullets)
+                if dead_enemy:
+                    dead_enemies.add(dead_enemy)
+                    self.enemy.remove(dead_enemy)
+                    self.particles.burst(dead_enemy.pos, dead_enemy.color, self.rng.randint(5, 10))
+                    self.scoring_system.add_kill(base_score=100, enemy_hp=dead_enemy.max_health)
             
         
 
-        # update particles
-        for p in self.particles[:]:
-            p.update(delta_time)
-            if p.lifetime <= 0:
-                self.particles.remove(p)
-        # update color switch particles
-        for p in self.color_particles[:]:
-            p.update(delta_time)
-            if p.lifetime <= 0:
-                self.color_particles.remove(p)
-        # update floating texts
-        for ft in self.floating_texts[:]:
-            ft.update(delta_time)
-            if ft.lifetime <= 0:
-                self.floating_texts.remove(ft)
-        self.aim_bar.update(self.player.pos)
+        with profiler.section("particles"):
+            # update particles
+            self.particles.update(delta_time)
+            # update color switch particles
+            self.color_particles.update(delta_time)
+            # update floating texts
+            for ft in self.floating_texts[:]:
+                ft.update(delta_time)
+                if ft.lifetime <= 0:
+                    self.floating_texts.remove(ft)
+        self.aim_bar.update(self.player.pos, self.controller.state.mouse_pos)
         
         self.power_bar.Update(delta_time)
         self.scoring_system.update(delta_time)
-        for enemy in self.enemy:
-            # track color change for chameleons
-            prev_color = getattr(enemy, 'prev_color', enemy.color)
-            enemy.update(delta_time)
-            # if color changed spawn effects
-            if enemy.color != prev_color:
-                for _ in range(10):
-                    self.color_particles.append(ColorParticle(enemy.pos, enemy.color))
+        with profiler.section("enemies"):
+            # every enemy moves in one pass; chameleons that changed color get effects
+            for enemy in self.enemy.update(delta_time, self.player):
+                self.color_particles.burst(enemy.pos, enemy.color, 10)
                 cname = "Red" if enemy.color == self.color_system.RED else "Blue"
                 self.floating_texts.append(FloatingText(enemy.pos, cname, enemy.color))
-            enemy.prev_color = enemy.color
-            new_bullets = enemy.get_bullets()
-            self.bullets.extend(new_bullets)
+            # every enemy due to fire emits its pattern in one batch
+            fire(self.enemy, self.bullets, self.player, BULLET_RADIUS)
+        with profiler.section("collision"):
             # Check enemy collision with player
-            if not self.player_dead and self.collision_system.circle_hit(self.player, enemy):
+            for enemy in self.collision_system.enemies_hitting(self.enemy, self.player.pos, self.player.radius):
+                if self.player_dead:
+                    break
                 self.player.health -= 50
-                try:
-                    self.enemy.remove(enemy)
-                except ValueError:
-                    pass
+                self.enemy.remove(enemy)
                 if self.player.health <= 0:
                     self.player_dead = True
-        self.player_bullets.extend(self.player.get_bullets())
+        with profiler.section("player"):
+            self.player.get_bullets(self.player_bullets)
         
-        # Update timer system and get enemies to spawn
-        self.timer_system.update(delta_time, self.enemy)
-        self.enemy = self.timer_system.get_enemies()
+        with profiler.section("timer"):
+            # Update timer system and get enemies to spawn
+            self.timer_system.update(delta_time, self.enemy)
+            self.enemy = self.timer_system.get_enemies()
+
+        with profiler.section("bullets"):
+            # drop bullets that were hit, left the arena or expired this frame
+            self.bullets.compact()
+            self.player_bullets.compact()
 
         # No boss anymore; completion is handled in render when time runs out
 
     def render(self, screen, delta_time):   
-        # Draw background if available, otherwise fill
-        if self.background_scaled:
-            screen.blit(self.background_scaled, (0, 0))
-        else:
-            screen.fill((228, 228, 228))
+        dirty = self.dirty_rects
+        profiler = self.game.profiler
+        with profiler.section("entity_render"):
+            # When time is up, show results directly
+            if self.timer_system.is_time_up():
+                final_rank = self.scoring_system.get_current_rank()
+                display_rank = final_rank if final_rank else "C"
+                screen.blit(self.hud.get_results_screen(self.scoring_system.get_score(), display_rank), (0, 0))
+                if dirty:
+                    dirty.invalidate()
+                return
 
-        # If player is dead, show death screen and stop rendering gameplay
-        if self.player_dead:
-            # Darken background
-            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
-            death_font = pygame.font.Font(None, 120)
-            death_text = death_font.render("YOU DIED", True, (200, 0, 0))
-            death_rect = death_text.get_rect(center=(screen.get_width()//2, 200))
-            screen.blit(death_text, death_rect)
+            if dirty and not self.player_dead:
+                # only put the background back where the last frame drew
+                dirty.restore(screen, self.background_scaled or (228, 228, 228))
+            # Draw background if available, otherwise fill
+            elif self.background_scaled:
+                screen.blit(self.background_scaled, (0, 0))
+            else:
+                screen.fill((228, 228, 228))
 
-            score_font = pygame.font.Font(None, 48)
-            score_text = score_font.render(f"FINAL SCORE: {self.scoring_system.get_score()}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(screen.get_width()//2, 320))
-            screen.blit(score_text, score_rect)
+            # If player is dead, show death screen and stop rendering gameplay
+            if self.player_dead:
+                # darkened background and the static text are pre-rendered
+                screen.blit(self.hud.get_death_screen(), (0, 0))
+                score_text = render_text(48, f"FINAL SCORE: {self.scoring_system.get_score()}", (255, 255, 255))
+                score_rect = score_text.get_rect(center=(screen.get_width()//2, 320))
+                screen.blit(score_text, score_rect)
+                if dirty:
+                    dirty.invalidate()
+                return
 
-            hint_font = pygame.font.Font(None, 28)
-            hint = hint_font.render("Press R to restart", True, (255, 255, 255))
-            hint_rect = hint.get_rect(center=(screen.get_width()//2, 380))
-            screen.blit(hint, hint_rect)
+            # everything below is queued per layer; the game layers are drawn
+            # here and the hud layer (widgets and aim bar) on top, in its own section
+            queue = self.render_queue
+            self._submit_entities(queue)
+            rects = queue.flush(screen, layers=ENTITY_LAYERS)
+        with profiler.section("hud_render"):
+            self._submit_hud(queue)
+            rects += queue.flush(screen, layers=("hud",))
+        if dirty:
+            return dirty.finish(rects)
 
-            return
-        for bullet in self.player_bullets:
-            bullet.render(screen)
-        self.player.render(screen)
-        for bullet in self.bullets:
-            bullet.render(screen)
+    def _submit_entities(self, queue):
+        # fast movers are drawn between the last two simulation ticks
+        alpha = self.game.interpolation
+        rewind = (1 - alpha) * self.game.fixed_delta
+        render_player_bullets(queue, self.player_bullets, rewind)
+        self.player.render(queue, alpha)
+        render_bullets(queue, self.bullets, rewind)
         for text in self.color_texts:
-            text.render(screen)
-        for enemy in self.enemy:
-            enemy.render(screen)
+            text.render(queue)
+        render_enemies(queue, self.enemy)
         # render particles
-        for p in self.particles:
-            p.render(screen)
+        render_triangle_particles(queue, self.particles)
         # render color switch particles
-        for p in self.color_particles:
-            p.render(screen)
+        render_color_particles(queue, self.color_particles)
         # render floating texts
         for ft in self.floating_texts:
-            ft.render(screen)
-        
-        self.aim_bar.render()
+            ft.render(queue)
         
-        fps_font = pygame.font.Font(None, 36)
-        fps_text = fps_font.render(f"FPS: {int(self.game.clock.get_fps())}", True, (0, 0, 0))
-        screen.blit(fps_text, (10, 10))
+        queue.draw("hud", self.aim_bar.render)
+
+    def _submit_hud(self, queue):
+        # HUD widgets are only re-rendered when the value they show changes
+        hud = self.hud
+        fps = int(self.game.clock.get_fps())
+        hud.set("fps", fps, lambda s: s.blit(render_text(36, f"FPS: {fps}", (0, 0, 0)), (10, 10)))
         # draw level indicator above bar
         level = int(self.timer_system.elapsed_time // 30) + 1
-        lvl_font = pygame.font.Font(None, 24)
-        lvl_text = lvl_font.render(f"Level {level}", True, (0,0,0))
-        screen.blit(lvl_text, (100, 750 - 30))
-        self.power_bar.render(screen, pygame.Vector2(100, 750),pygame.Vector2(1000, 25))
+        hud.set("level", level, lambda s: s.blit(render_text(24, f"Level {level}", (0,0,0)), (100, 750 - 30)))
+        bar_pos, bar_size = pygame.Vector2(100, 750), pygame.Vector2(1000, 25)
+        hud.set("power_bar", self.power_bar.get_render_key(bar_size),
+                lambda s: self.power_bar.render(s, bar_pos, bar_size))
         
         # Display timer at the top
         remaining_time = self.timer_system.get_remaining_time()
@@ -243,65 +290,28 @@ class GameplayScene(Scene):
         else:
             timer_color = (200, 0, 0)  # Red
         
-        timer_font = pygame.font.Font(None, 64)
-        timer_text = timer_font.render(timer_text_content, True, timer_color)
-        timer_rect = timer_text.get_rect(center=(600, 30))
-        screen.blit(timer_text, timer_rect)
-        
-        # When time is up, show results directly
-        if self.timer_system.is_time_up():
-            # End game results screen
-            screen.fill((0, 0, 0))
-            
-            # Time-up message
-            victory_font = pygame.font.Font(None, 100)
-            victory_text = victory_font.render("TIME'S UP!", True, (0, 255, 0))
-            victory_rect = victory_text.get_rect(center=(600, 150))
-            screen.blit(victory_text, victory_rect)
-            
-            # Final score
-            score_font = pygame.font.Font(None, 60)
-            final_score = self.scoring_system.get_score()
-            score_text = score_font.render(f"FINAL SCORE: {final_score}", True, (255, 255, 0))
-            score_rect = score_text.get_rect(center=(600, 300))
-            screen.blit(score_text, score_rect)
-            
-            # Final rank
-            final_rank = self.scoring_system.get_current_rank()
-            rank_font = pygame.font.Font(None, 80)
-            display_rank = final_rank if final_rank else "C"
-            rank_text = rank_font.render(display_rank, True, (255, 100, 0))
-            rank_rect = rank_text.get_rect(center=(600, 450))
-            screen.blit(rank_text, rank_rect)
-            
-            # Completion message
-            complete_font = pygame.font.Font(None, 40)
-            complete_text = complete_font.render("SUCCESS!", True, (0, 200, 255))
-            complete_rect = complete_text.get_rect(center=(600, 600))
-            screen.blit(complete_text, complete_rect)
-            
-            return
+        def draw_timer(s):
+            timer_text = render_text(64, timer_text_content, timer_color)
+            return s.blit(timer_text, timer_text.get_rect(center=(600, 30)))
+        hud.set("timer", (timer_text_content, timer_color), draw_timer)
         
         # Display score on right side
-        score_font = pygame.font.Font(None, 48)
-        score_text = score_font.render(f"SCORE: {self.scoring_system.get_score()}", True, (0, 0, 0))
-        screen.blit(score_text, (1000, 60))
+        score = self.scoring_system.get_score()
+        hud.set("score", score, lambda s: s.blit(render_text(48, f"SCORE: {score}", (0, 0, 0)), (1000, 60)))
         
         # Display multiplier info on right
         streak = self.scoring_system.get_kill_streak()
         if streak > 0:
             multiplier = self.scoring_system.get_multiplier()
+            color = self.color_system.current_color()
             
             # Display multiplier name
             name = self.scoring_system.get_multiplier_message()
-            name_font = pygame.font.Font(None, 36)
-            name_text = name_font.render(name, True, self.color_system.current_color())
-            screen.blit(name_text, (1000, 120))
+            hud.set("streak_name", (name, color), lambda s: s.blit(render_text(36, name, color), (1000, 120)))
             
             # Display multiplier value underneath name
-            mult_font = pygame.font.Font(None, 32)
-            mult_text = mult_font.render(f"x{multiplier:.0f}", True, self.color_system.current_color())
-            screen.blit(mult_text, (1000, 160))
+            hud.set("streak_multiplier", (multiplier, color),
+                    lambda s: s.blit(render_text(32, f"x{multiplier:.0f}", color), (1000, 160)))
             
             # combined multiplier/timeout bar (colored) based on remaining time
             timeout_duration = self.scoring_system.get_streak_timeout()
@@ -311,14 +321,19 @@ class GameplayScene(Scene):
             bar_height = 20
             bar_x = 1000
             bar_y = 200
-            # background
-            pygame.draw.rect(screen, (150, 150, 150), (bar_x, bar_y, bar_width, bar_height))
-            # colored fill
-            pygame.draw.rect(screen, self.color_system.current_color(), (bar_x, bar_y, bar_width * fill_percent, bar_height))
-            pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 2)
-            # Draw time text
+            fill_width = int(bar_width * fill_percent)
             time_text = f"{time_remaining:.1f}s"
-            time_font = pygame.font.Font(None, 20)
-            time_surface = time_font.render(time_text, True, (0, 0, 0))
-            time_rect = time_surface.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
-            screen.blit(time_surface, time_rect)
\ No newline at end of file
+            def draw_streak_bar(s):
+                # background, fill and frame
+                pygame.draw.rect(s, (150, 150, 150), (bar_x, bar_y, bar_width, bar_height))
+                pygame.draw.rect(s, color, (bar_x, bar_y, fill_width, bar_height))
+                s.blit(hud.get_frame(bar_width, bar_height), (bar_x, bar_y))
+                # Draw time text
+                time_surface = render_text(20, time_text, (0, 0, 0))
+                s.blit(time_surface, time_surface.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2)))
+                return pygame.Rect(bar_x, bar_y, bar_width, bar_height)
+            hud.set("streak_bar", (fill_width, color, time_text), draw_streak_bar)
+        else:
+            for name in ("streak_name", "streak_multiplier", "streak_bar"):
+                hud.remove(name)
+        hud.render(queue)
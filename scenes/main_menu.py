@@ -1,33 +1,29 @@
 import pygame
 
 from core.scene import Scene
-from scenes.gameplay import GameplayScene
+from core.fonts import get_font, text_cache
+from scenes.gameplay import GameplayScene, get_preload_assets
 
 
 class MainMenuScene(Scene):
     def __init__(self, game):
         self.game = game
-        # optionally preload fonts or images here
-        try:
-            self.title_font = pygame.font.Font(None, 80)
-            self.inst_font = pygame.font.Font(None, 36)
-        except Exception:
-            self.title_font = pygame.font.SysFont("arial", 80)
-            self.inst_font = pygame.font.SysFont("arial", 36)
+        self.title_font = get_font(80)
+        self.inst_font = get_font(36)
+        # decode gameplay images in the background while the menu is up
+        self.game.assets.preload(get_preload_assets(self.game.screen.get_size()))
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+                self.game.quit()
             if event.type == pygame.KEYDOWN:
                 # start the game on Enter or Space
                 if event.key in (pygame.K_RETURN, pygame.K_SPACE):
                     self.game.scene = GameplayScene(self.game)
                 # allow quitting from menu
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    exit()
+                    self.game.quit()
 
     def update(self, delta):
         # nothing to update on static menu
@@ -38,7 +34,7 @@ class MainMenuScene(Scene):
         screen.fill((20, 20, 20))
 
         # title
-        title_surf = self.title_font.render("HUE SHIFT", True, (255, 255, 255))
+        title_surf = text_cache.get(self.title_font, "HUE SHIFT", (255, 255, 255))
         title_rect = title_surf.get_rect(center=(screen.get_width() // 2, 150))
         screen.blit(title_surf, title_rect)
 
@@ -52,6 +48,6 @@ class MainMenuScene(Scene):
             "Esc to quit"
         ]
         for i, line in enumerate(instructions):
-            text = self.inst_font.render(line, True, (200, 200, 200))
+            text = text_cache.get(self.inst_font, line, (200, 200, 200))
             rect = text.get_rect(center=(screen.get_width() // 2, 250 + i * 50))
             screen.blit(text, rect)
@@ -0,0 +1,268 @@
+import glob
+import json
+import math
+import os
+import numpy as np
+
+# Bullet patterns are data. A pattern file is a JSON object of
+# name -> pattern, where a pattern has:
+#   id           Pattern id enemies are spawned with (required)
+#   interval     Seconds between bursts (required)
+#   delay        Seconds after spawning before the first burst can fire
+#   aim          "player": relative to the direction to the player (nothing is
+#                fired when on top of it); "fixed": relative to the x axis
+#   count        Bullets per volley
+#   spread       Radians between neighbouring bullets, centred on the aim,
+#                or "ring" to spread them evenly around a full circle
+#   angles       Explicit bullet angles in radians, instead of count/spread
+#   offset       Radians added to every bullet angle
+#   spin         Radians the aim turns per second the enemy has been active
+#   bursts       Volleys per burst
+#   burst_delay  Seconds between the volleys of a burst
+#   burst_turn   Radians each volley turns from the one before
+#   speed        Bullet speed multipliers, linearly interpolated across the
+#                volleys of a burst ([1.0] keeps the enemy's bullet speed)
+#   spawn_after  Fraction (0-1) of the run after which the timer starts
+#                spawning enemies with this pattern; leave it out for
+#                patterns that are never spawned in play
+# A burst starts when the shoot timer is up and the player shares the
+# enemy's color; once started, its remaining volleys fire regardless.
+DEFAULTS = {"delay": 0.0, "aim": "player", "count": 1, "spread": 0.0, "offset": 0.0, "spin": 0.0,
+            "bursts": 1, "burst_delay": 0.0, "burst_turn": 0.0, "speed": [1.0], "spawn_after": None}
+
+# the built-in patterns; the timer adds cone, alternating and spiral as the run goes on
+PATTERNS = {
+    "float": {"id": 0, "interval": 1.0, "count": 0, "spawn_after": 0.0},  # floating guys don't fire at all
+    "cone": {"id": 1, "interval": 0.8, "count": 2, "spread": 0.4, "spawn_after": 0.25},
+    "alternating": {"id": 2, "interval": 0.6, "count": 3, "spread": 0.5, "spawn_after": 0.5},
+    "burst": {"id": 3, "interval": 0.5},  # single bullet, fired often
+    "spiral": {"id": 4, "interval": 1.2, "aim": "fixed", "count": 4, "spread": "ring", "spin": 2.0,
+               "spawn_after": 0.75},
+    "omnidirectional": {"id": 5, "interval": 1.0, "aim": "fixed", "count": 8, "spread": "ring"},
+}
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _angles(spec):
+    if "angles" in spec:
+        angles = [float(a) for a in spec["angles"]]
+    elif spec["spread"] == "ring":
+        angles = [2 * math.pi * i / spec["count"] for i in range(spec["count"])]
+    else:
+        angles = [(i - (spec["count"] - 1) / 2) * spec["spread"] for i in range(spec["count"])]
+    return [a + spec["offset"] for a in angles]
+
+
+class PatternBank:
+    def __init__(self, specs=None):
+        """
+        Bullet patterns by id, compiled into flat arrays for fire
+        Arguments:
+            specs: Dict of name -> pattern to start with (see the format above)
+        """
+        # id -> pattern with defaults filled in
+        self.patterns = {}
+        self.ids = {}
+        self._compiled = None
+        for name, spec in (specs or {}).items():
+            self.add(name, spec)
+
+    def add(self, name, spec):
+        """Add a pattern, replacing any with the same id. Raises ValueError if it is malformed."""
+        unknown = set(spec) - set(DEFAULTS) - {"id", "interval", "angles"}
+        if unknown:
+            raise ValueError(f"pattern {name!r}: unknown keys {sorted(unknown)}")
+        if "id" not in spec or "interval" not in spec:
+            raise ValueError(f"pattern {name!r}: id and interval are required")
+        spec = {**DEFAULTS, **spec, "name": name}
+        for key in ("id", "count", "bursts"):
+            if not _is_int(spec[key]):
+                raise ValueError(f"pattern {name!r}: {key} must be an integer")
+        for key in ("interval", "delay", "offset", "spin", "burst_delay", "burst_turn"):
+            if not _is_number(spec[key]):
+                raise ValueError(f"pattern {name!r}: {key} must be a number")
+        if spec["spawn_after"] is not None and not _is_number(spec["spawn_after"]):
+            raise ValueError(f"pattern {name!r}: spawn_after must be a number")
+        if spec["spread"] != "ring" and not _is_number(spec["spread"]):
+            raise ValueError(f"pattern {name!r}: spread must be a number or 'ring'")
+        for key in ("angles", "speed"):
+            if key in spec and not (isinstance(spec[key], list) and all(_is_number(v) for v in spec[key])):
+                raise ValueError(f"pattern {name!r}: {key} must be a list of numbers")
+        if spec["aim"] not in ("player", "fixed"):
+            raise ValueError(f"pattern {name!r}: aim must be 'player' or 'fixed'")
+        if not 0 <= spec["id"] <= np.iinfo(np.int8).max:
+            raise ValueError(f"pattern {name!r}: id must be between 0 and 127")
+        if spec["count"] < 0 or spec["bursts"] < 1 or not spec["speed"]:
+            raise ValueError(f"pattern {name!r}: needs a count of 0 or more, at least one burst and one speed")
+        spec["angles"] = _angles(spec)
+        # a name or an id that is already taken replaces the pattern it belongs to
+        old_id = self.ids.pop(name, None)
+        if old_id is not None:
+            del self.patterns[old_id]
+        old = self.patterns.get(spec["id"])
+        if old is not None:
+            del self.ids[old["name"]]
+        self.patterns[spec["id"]] = spec
+        self.ids[name] = spec["id"]
+        self._compiled = None
+
+    def load(self, path):
+        """
+        Add the patterns from a JSON file, or from every .json file in a
+        directory. Raises ValueError for a malformed file or pattern, in
+        which case none of the patterns are added.
+        """
+        paths = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+        # everything is added to a copy first, so a bad entry leaves this bank untouched
+        staged = PatternBank()
+        staged.patterns, staged.ids = dict(self.patterns), dict(self.ids)
+        for p in paths:
+            with open(p) as f:
+                specs = json.load(f)
+            if not isinstance(specs, dict):
+                raise ValueError(f"{p}: expected an object of name -> pattern")
+            for name, spec in specs.items():
+                if not isinstance(spec, dict):
+                    raise ValueError(f"{p}: pattern {name!r} must be an object")
+                staged.add(name, spec)
+        # compile now so a bad file fails here rather than mid-game in fire
+        staged.compiled()
+        self.patterns, self.ids, self._compiled = staged.patterns, staged.ids, staged._compiled
+
+    def get(self, pattern_id):
+        """Get a pattern by id. Raises ValueError if there is none."""
+        pattern = self.patterns.get(pattern_id)
+        if pattern is None:
+            raise ValueError(f"unknown bullet pattern {pattern_id}")
+        return pattern
+
+    def id_of(self, name):
+        return self.ids[name]
+
+    def spawnable(self, time_progress):
+        """Get the ids, in order, of the patterns enemies may spawn with this far (0-1) into a run"""
+        return sorted(pattern_id for pattern_id, spec in self.patterns.items()
+                      if spec["spawn_after"] is not None and spec["spawn_after"] <= time_progress)
+
+    def compiled(self):
+        """
+        The patterns as arrays indexed by pattern id, plus the bullet and
+        speed tables they point into. Rebuilt after patterns are added.
+        """
+        if self._compiled is None:
+            size = max(self.patterns) + 1
+            c = {"aimed": np.zeros(size, dtype=bool), "spin": np.zeros(size),
+                 "bursts": np.ones(size, dtype=np.int64), "burst_delay": np.zeros(size),
+                 "burst_turn": np.zeros(size), "table_start": np.zeros(size, dtype=np.int64),
+                 "table_count": np.zeros(size, dtype=np.int64),
+                 "speed_start": np.zeros(size, dtype=np.int64)}
+            cos, sin, speed = [], [], []
+            for pattern_id, spec in self.patterns.items():
+                c["aimed"][pattern_id] = spec["aim"] == "player"
+                for key in ("spin", "bursts", "burst_delay", "burst_turn"):
+                    c[key][pattern_id] = spec[key]
+                c["table_start"][pattern_id] = len(cos)
+                c["table_count"][pattern_id] = len(spec["angles"])
+                cos.extend(math.cos(a) for a in spec["angles"])
+                sin.extend(math.sin(a) for a in spec["angles"])
+                # one speed multiplier per volley, sampled from the curve
+                c["speed_start"][pattern_id] = len(speed)
+                keys = spec["speed"]
+                volleys = spec["bursts"]
+                speed.extend(np.interp(np.linspace(0, len(keys) - 1, volleys),
+                                       np.arange(len(keys)), keys).tolist())
+            c["cos"], c["sin"], c["speed"] = np.array(cos), np.array(sin), np.array(speed)
+            self._compiled = c
+        return self._compiled
+
+
+# shared bank; pattern files add to it before enemies are spawned
+patterns = PatternBank(PATTERNS)
+
+
+def load_patterns(path):
+    patterns.load(path)
+
+
+def get_pattern(pattern_id):
+    return patterns.get(pattern_id)
+
+
+def spawnable_patterns(time_progress):
+    return patterns.spawnable(time_progress)
+
+
+def fire(enemies, pool, player, radius, idx=None, bank=None):
+    """
+    Run every enemy's pattern for this tick and emit all their bullets as one batch
+    Arguments:
+        enemies: EnemyManager
+        pool: Bullet pool to emit into
+        player: Aimed patterns aim at it, and only enemies of its color start a burst
+        radius: Bullet radius
+        idx: Slot indices to run, or None for every enemy
+        bank: PatternBank, or None for the shared one
+    Bullets are emitted grouped by enemy, in slot order.
+    """
+    c = (bank or patterns).compiled()
+    if idx is None:
+        idx = np.arange(enemies.count)
+    pattern_ids = enemies.pattern[idx]
+    volley = enemies.volley[idx]
+
+    # enemies whose shoot timer is up start a burst with volley 0
+    start = ~enemies.spawning[idx] & (volley == 0) & (enemies.shoot_timer[idx] >= enemies.shoot_interval[idx])
+    # only shoot if player and enemy share color
+    if player:
+        start &= enemies.color[idx] == enemies.color_index(player.color)
+    enemies.shoot_timer[idx[start]] = 0
+    # the rest of a burst follows burst_delay apart
+    due = (volley > 0) & (enemies.volley_timer[idx] >= c["burst_delay"][pattern_ids])
+    firing = start | due
+    if not firing.any():
+        return
+    events, pattern_ids, volley = idx[firing], pattern_ids[firing], volley[firing]
+    following = volley + 1
+    following[following >= c["bursts"][pattern_ids]] = 0
+    enemies.volley[events] = following
+    enemies.volley_timer[events] = 0
+
+    # each event's base direction: toward the player or along the x axis,
+    # turned by its spin and by its volley's turn within the burst
+    aim = np.zeros((len(events), 2))
+    aim[:, 0] = 1
+    aimed = c["aimed"][pattern_ids]
+    if aimed.any():
+        keep = ~aimed
+        if player:
+            to_player = np.array(player.pos, dtype=float) - enemies.pos[events[aimed]]
+            length = np.sqrt(to_player[:, 0] ** 2 + to_player[:, 1] ** 2)
+            aim[aimed] = to_player / np.where(length > 0, length, 1)[:, None]
+            keep[aimed] = length > 0
+        events, pattern_ids, volley, aim = events[keep], pattern_ids[keep], volley[keep], aim[keep]
+    turn = enemies.angle_offset[events] * c["spin"][pattern_ids] + volley * c["burst_turn"][pattern_ids]
+    cos_t, sin_t = np.cos(turn), np.sin(turn)
+    bx = aim[:, 0] * cos_t - aim[:, 1] * sin_t
+    by = aim[:, 1] * cos_t + aim[:, 0] * sin_t
+
+    # expand every event into its pattern's bullets
+    counts = c["table_count"][pattern_ids]
+    total = int(counts.sum())
+    if total == 0:
+        return
+    owner = np.repeat(np.arange(len(events)), counts)
+    rows = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows += c["table_start"][pattern_ids][owner]
+    c_cos, c_sin = c["cos"][rows], c["sin"][rows]
+    bx, by = bx[owner], by[owner]
+    directions = np.stack([bx * c_cos - by * c_sin, by * c_cos + bx * c_sin], axis=1)
+    speed = enemies.bullet_speed[events] * c["speed"][c["speed_start"][pattern_ids] + volley]
+    slots = events[owner]
+    pool.spawn_many(enemies.pos[slots], directions, enemies.color[slots], speed[owner], radius, enemies.palette)
@@ -0,0 +1,138 @@
+import numpy as np
+from systems.soa import StructOfArrays
+
+
+class BulletPool(StructOfArrays):
+    FIELDS = (
+        ("pos", float, (2,)),
+        ("vel", float, (2,)),
+        ("radius", float, ()),
+        ("age", float, ()),
+        ("color", np.int8, ()),
+        ("alive", bool, ()),
+    )
+
+    def __init__(self, capacity=256, bounds=(-100, -100, 1300, 900), max_lifetime=10.0):
+        """
+        Initialize a pool of bullets stored in contiguous arrays
+        Arguments:
+            capacity: Number of slots allocated up front (doubles when full)
+            bounds: Arena as (left, top, right, bottom); bullets outside are culled
+            max_lifetime: Seconds a bullet may live before it is culled
+        """
+        super().__init__(capacity)
+        self.bounds = bounds
+        self.max_lifetime = max_lifetime
+        # how many bullets were removed, and why
+        self.culled = {"arena": 0, "lifetime": 0, "hit": 0}
+
+    def spawn(self, pos, direction, color, speed, radius):
+        """
+        Emit a bullet into the first free slot
+        Arguments:
+            pos: Starting position
+            direction: Unit direction of travel
+            color: RGB color of the bullet
+            speed: Speed in pixels per second
+            radius: Collision and render radius
+        Returns the slot index of the new bullet (valid until the next compact).
+        """
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.count += 1
+        self.pos[i] = pos[0], pos[1]
+        self.vel[i] = direction[0] * speed, direction[1] * speed
+        self.radius[i] = radius
+        self.age[i] = 0
+        self.color[i] = self.color_index(color)
+        self.alive[i] = True
+        return i
+
+    def spawn_many(self, pos, direction, color, speed, radius, palette=None):
+        """
+        Emit many bullets at once, in order, after the live ones
+        Arguments:
+            pos: (N, 2) starting positions
+            direction: (N, 2) unit directions of travel
+            color: RGB color of every bullet, or (N,) indices into palette
+            speed: Speed in pixels per second, single or (N,)
+            radius: Collision and render radius, single or (N,)
+            palette: RGB colors that color indexes (e.g. an EnemyManager's)
+        """
+        n = len(pos)
+        if self.count + n > self.capacity:
+            self._grow(self.count + n)
+        start, end = self.count, self.count + n
+        self.count = end
+        self.pos[start:end] = pos
+        self.vel[start:end] = direction * np.reshape(speed, (-1, 1))
+        self.radius[start:end] = radius
+        self.age[start:end] = 0
+        if palette is None:
+            self.color[start:end] = self.color_index(color)
+        else:
+            lookup = np.array([self.color_index(c) for c in palette], dtype=np.int8)
+            self.color[start:end] = lookup[color]
+        self.alive[start:end] = True
+
+    def kill(self, i):
+        """Mark the bullet in slot i as hit; its slot is freed on the next compact"""
+        if self.alive[i]:
+            self.alive[i] = False
+            self.culled["hit"] += 1
+
+    def update(self, delta):
+        """Move every bullet in one step and mark those that left the arena or expired"""
+        n = self.count
+        pos = self.pos[:n]
+        alive = self.alive[:n]
+        pos += self.vel[:n] * delta
+        self.age[:n] += delta
+
+        left, top, right, bottom = self.bounds
+        outside = alive & ((pos[:, 0] < left) | (pos[:, 0] > right) |
+                           (pos[:, 1] < top) | (pos[:, 1] > bottom))
+        alive &= ~outside
+        expired = alive & (self.age[:n] > self.max_lifetime)
+        alive &= ~expired
+        self.culled["arena"] += int(outside.sum())
+        self.culled["lifetime"] += int(expired.sum())
+
+    def compact(self):
+        """Pack live bullets to the front of the arrays, dropping dead ones"""
+        n = self.count
+        keep = self.alive[:n]
+        live = int(keep.sum())
+        if live == n:
+            return
+        for arr in (self.pos, self.vel, self.radius, self.age, self.color):
+            arr[:live] = arr[:n][keep]
+        self.alive[:live] = True
+        self.alive[live:n] = False
+        self.count = live
+
+    def indices(self):
+        """Get the slot indices of all live bullets"""
+        return np.flatnonzero(self.alive[:self.count])
+
+    def render_positions(self, rewind=0.0):
+        """Get bullet positions moved back along their velocity by rewind seconds
+        (used to interpolate between simulation ticks). A bullet is never
+        rewound further than its age, so one spawned this tick stays at its
+        spawn point instead of being drawn behind it."""
+        n = self.count
+        if rewind == 0:
+            return self.pos[:n]
+        return self.pos[:n] - self.vel[:n] * np.minimum(rewind, self.age[:n])[:, None]
+
+    def get_live_count(self):
+        """Get the number of bullets currently alive"""
+        return int(self.alive[:self.count].sum())
+
+    def get_culled_count(self):
+        """Get the total number of bullets removed so far"""
+        return sum(self.culled.values())
+
+    def __len__(self):
+        return self.get_live_count()
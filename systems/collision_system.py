@@ -1,4 +1,160 @@
+import math
+import numpy as np
+
+
+class SpatialHash():
+    def __init__(self, cell_size=64):
+        """
+        Uniform grid that buckets items by the cell containing their centre
+        Arguments:
+            cell_size: Width and height of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        # queries are widened by the largest radius inserted so far
+        self.max_radius = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.max_radius = 0
+
+    def insert(self, item, pos, radius):
+        """Insert a single item (e.g. an enemy) at pos"""
+        cell = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        self.cells.setdefault(cell, []).append(item)
+        self.max_radius = max(self.max_radius, radius)
+
+    def insert_many(self, items, positions, radii):
+        """Insert many items at once, grouping them by cell with NumPy"""
+        if len(items) == 0:
+            return
+        cells = np.floor_divide(positions, self.cell_size).astype(np.int64)
+        keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        bounds = np.searchsorted(inverse.ravel()[order], np.arange(len(keys) + 1))
+        items = np.asarray(items)[order]
+        for k, (cx, cy) in enumerate(keys.tolist()):
+            self.cells.setdefault((cx, cy), []).extend(items[bounds[k]:bounds[k + 1]].tolist())
+        self.max_radius = max(self.max_radius, float(np.max(radii)))
+
+    def cells_in_range(self, pos, reach):
+        """Get the cell coordinates overlapped by a square of half-size reach around pos"""
+        cs = self.cell_size
+        x0, x1 = math.floor((pos[0] - reach) / cs), math.floor((pos[0] + reach) / cs)
+        y0, y1 = math.floor((pos[1] - reach) / cs), math.floor((pos[1] + reach) / cs)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def query(self, pos, radius):
+        """Get every item that could overlap a circle at pos (broad phase only)"""
+        found = []
+        for cell in self.cells_in_range(pos, radius + self.max_radius):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.extend(bucket)
+        return found
+
+
 class CollisionSystem():
+    def __init__(self, cell_size=64):
+        self.enemy_grid = SpatialHash(cell_size)
+        self.bullet_grid = SpatialHash(cell_size)
+        self.bullet_pool = None
+        self.enemies = None
+
     def circle_hit(self, a, b):
         return a.pos.distance_to(b.pos) <= a.radius + b.radius
-    
\ No newline at end of file
+
+    def circles_hit_mask(self, a_pos, a_radius, b_pos, b_radius):
+        """
+        Batch circle test between N circles and M circles
+        Arguments:
+            a_pos: (N, 2) array of centres
+            a_radius: (N,) array of radii, or a single radius
+            b_pos: (M, 2) array of centres
+            b_radius: (M,) array of radii, or a single radius
+        Returns an (N, M) boolean mask; squared distances are compared so no sqrt is taken.
+        """
+        a_pos = np.asarray(a_pos, dtype=float).reshape(-1, 2)
+        b_pos = np.asarray(b_pos, dtype=float).reshape(-1, 2)
+        a_radius = np.broadcast_to(np.asarray(a_radius, dtype=float), (len(a_pos),))
+        b_radius = np.broadcast_to(np.asarray(b_radius, dtype=float), (len(b_pos),))
+        dx = a_pos[:, 0, None] - b_pos[None, :, 0]
+        dy = a_pos[:, 1, None] - b_pos[None, :, 1]
+        reach = a_radius[:, None] + b_radius[None, :]
+        return dx * dx + dy * dy <= reach * reach
+
+    def circles_hit_pairs(self, a_pos, a_radius, b_pos, b_radius):
+        """Same as circles_hit_mask, but returns (a indices, b indices) of every hit"""
+        return np.nonzero(self.circles_hit_mask(a_pos, a_radius, b_pos, b_radius))
+
+    def enemies_hitting(self, enemies, pos, radius):
+        """Get the enemies in an EnemyManager overlapping a circle at pos"""
+        n = len(enemies)
+        if not n:
+            return []
+        mask = self.circles_hit_mask(enemies.pos[:n], enemies.radius[:n], (pos[0], pos[1]), radius)[:, 0]
+        return [enemies[k] for k in np.flatnonzero(mask)]
+
+    def rebuild(self, enemies, bullet_pool):
+        """
+        Rebuild the broad phase; call once per frame after everything has moved
+        Arguments:
+            enemies: EnemyManager whose enemies player bullets can hit
+            bullet_pool: Enemy bullet pool that can hit the player
+        The enemy grid holds slot indices, so it is only valid until the
+        next enemy is removed.
+        """
+        self.enemy_grid.clear()
+        self.enemies = enemies
+        n = len(enemies)
+        self.enemy_grid.insert_many(np.arange(n), enemies.pos[:n], enemies.radius[:n])
+        self.bullet_grid.clear()
+        self.bullet_pool = bullet_pool
+        idx = bullet_pool.indices()
+        self.bullet_grid.insert_many(idx, bullet_pool.pos[idx], bullet_pool.radius[idx])
+
+    def enemies_near(self, pos, radius):
+        """Get the enemies a circle at pos could hit"""
+        return [self.enemies[i] for i in self.enemy_grid.query(pos, radius)]
+
+    def bullets_near(self, pos, radius):
+        """Get the slot indices of enemy bullets that could hit a circle at pos"""
+        return np.array(self.bullet_grid.query(pos, radius), dtype=np.int64)
+
+    def bullets_hitting(self, pos, radius):
+        """Get the slot indices of live enemy bullets overlapping a circle at pos"""
+        pool = self.bullet_pool
+        idx = self.bullets_near(pos, radius)
+        idx = idx[pool.alive[idx]]
+        mask = self.circles_hit_mask(pool.pos[idx], pool.radius[idx], (pos[0], pos[1]), radius)
+        return idx[mask[:, 0]]
+
+    def bullet_enemy_pairs(self, pool):
+        """
+        Find every colliding (bullet index, enemy) pair for a bullet pool
+        against the enemies in the grid, ordered by bullet index
+        """
+        idx = pool.indices()
+        if len(idx) == 0 or not self.enemy_grid.cells:
+            return []
+        # bucket the bullets by cell, then test each bucket against the
+        # enemies around that cell in one batch
+        grid = self.enemy_grid
+        enemies = self.enemies
+        cells = np.floor_divide(pool.pos[idx], grid.cell_size).astype(np.int64)
+        keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        # a bucket query has to cover the whole cell plus the largest bullet
+        reach = float(pool.radius[idx].max()) + grid.cell_size / 2
+        found = []
+        for k, (cx, cy) in enumerate(keys.tolist()):
+            centre = ((cx + 0.5) * grid.cell_size, (cy + 0.5) * grid.cell_size)
+            slots = grid.query(centre, reach)
+            if not slots:
+                continue
+            group = idx[inverse == k]
+            hit_b, hit_e = self.circles_hit_pairs(pool.pos[group], pool.radius[group],
+                                                  enemies.pos[slots], enemies.radius[slots])
+            found.extend((int(group[b]), enemies[slots[e]]) for b, e in zip(hit_b.tolist(), hit_e.tolist()))
+        found.sort(key=lambda pair: pair[0])
+        return found
@@ -0,0 +1,163 @@
+import numpy as np
+from systems.soa import StructOfArrays
+
+# strength of the perpendicular wobble basic (pattern 0) enemies spiral in with
+SPIRAL_STRENGTH = 0.5
+
+
+class EnemyManager(StructOfArrays):
+    FIELDS = (
+        ("pos", float, (2,)),
+        ("speed", float, ()),
+        ("radius", float, ()),
+        ("pattern", np.int8, ()),
+        ("shoot_timer", float, ()),
+        ("shoot_interval", float, ()),
+        ("angle_offset", float, ()),
+        ("spawn_timer", float, ()),
+        ("spawn_delay", float, ()),
+        ("spawning", bool, ()),
+        ("flash_timer", float, ()),
+        ("color", np.int8, ()),
+        ("chameleon", bool, ()),
+        ("bullet_speed", float, ()),
+        # next volley of the burst in progress (0 when none is) and the time since the last one
+        ("volley", np.int16, ()),
+        ("volley_timer", float, ()),
+    )
+
+    def __init__(self, capacity=64):
+        """
+        Keeps the per-frame state of every enemy in contiguous arrays and
+        updates all of them in one vectorized pass. Enemy objects are views
+        onto a slot; iterating the manager yields them in slot order, so it
+        can be used wherever a list of enemies was.
+        Arguments:
+            capacity: Number of slots allocated up front (doubles when full)
+        """
+        super().__init__(capacity)
+        # views[i] is the enemy in slot i
+        self.views = []
+
+    def add(self, enemy, **state):
+        """
+        Put an enemy into the next free slot
+        Arguments:
+            enemy: View object; its _manager and _slot are pointed at the slot
+            state: Initial value for each field; color is an RGB tuple
+        """
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.count += 1
+        for name, dtype, shape in self.FIELDS:
+            getattr(self, name)[i] = 0
+        for name, value in state.items():
+            if name == "color":
+                value = self.color_index(value)
+            getattr(self, name)[i] = value
+        self.views.append(enemy)
+        enemy._manager, enemy._slot, enemy._state = self, i, None
+        return i
+
+    def append(self, enemy):
+        """Move an enemy (and its state) into this manager, out of whichever one holds it"""
+        if enemy._manager is self:
+            return
+        if enemy._manager is not None:
+            enemy._manager.remove(enemy)
+        self.add(enemy, **enemy._state)
+
+    def remove(self, enemy):
+        """
+        Take an enemy out of the manager. Its state is copied into the
+        enemy itself (see state), so it can still be read (e.g. for its
+        death burst).
+        """
+        if enemy._manager is not self:
+            raise ValueError("enemy is not in this manager")
+        slot = enemy._slot
+        state = self.state(slot)
+        self._release(slot)
+        enemy._manager, enemy._slot, enemy._state = None, None, state
+
+    def state(self, i):
+        """Get a copy of every field of slot i as a dict, with the color as an RGB tuple"""
+        state = {name: getattr(self, name)[i].copy() for name, _, _ in self.FIELDS}
+        state["color"] = self.color_at(i)
+        return state
+
+    def _release(self, i):
+        """Free slot i by moving the last enemy into it"""
+        last = self.count - 1
+        if i != last:
+            for array in self._arrays():
+                array[i] = array[last]
+            moved = self.views[last]
+            self.views[i] = moved
+            moved._slot = i
+        self.views.pop()
+        self.count -= 1
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, i):
+        return self.views[i]
+
+    def __contains__(self, enemy):
+        return enemy._manager is self
+
+    def update(self, delta, player, idx=None):
+        """
+        Spawn timers, homing, spiral steering and flash timers for every enemy
+        Arguments:
+            delta: Seconds since the last update
+            player: Player every enemy homes in on (chameleons take its color)
+            idx: Slot indices to update, or None for all of them
+        Returns the enemies whose color changed during the update.
+        """
+        if idx is None:
+            idx = np.arange(self.count)
+        if len(idx) == 0:
+            return []
+        old_color = self.color[idx]
+        if player:
+            chameleons = idx[self.chameleon[idx]]
+            self.color[chameleons] = self.color_index(player.color)
+
+        # enemies still spawning only run their spawn timer this update
+        spawning = self.spawning[idx]
+        waiting = idx[spawning]
+        self.spawn_timer[waiting] += delta
+        done = waiting[self.spawn_timer[waiting] >= self.spawn_delay[waiting]]
+        self.spawning[done] = False
+        self.spawn_timer[done] = 0
+
+        active = idx[~spawning]
+        self.shoot_timer[active] += delta
+        self.volley_timer[active] += delta
+        self.angle_offset[active] += delta
+
+        # move towards the player, with a spiral effect for basic enemies
+        if player and len(active):
+            direction = np.array(player.pos, dtype=float) - self.pos[active]
+            length = np.sqrt(direction[:, 0] ** 2 + direction[:, 1] ** 2)
+            moving = length > 0
+            active, direction = active[moving], direction[moving] / length[moving, None]
+            spiral = self.pattern[active] == 0
+            if spiral.any():
+                d = direction[spiral]
+                # add a small perpendicular component that oscillates
+                perp = np.stack([-d[:, 1], d[:, 0]], axis=1)
+                wobble = np.sin(self.angle_offset[active[spiral]] * 5) * SPIRAL_STRENGTH
+                d = d + perp * wobble[:, None]
+                direction[spiral] = d / np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2)[:, None]
+            self.pos[active] += direction * self.speed[active, None] * delta
+
+        flashing = idx[~spawning]
+        flashing = flashing[self.flash_timer[flashing] > 0]
+        self.flash_timer[flashing] -= delta
+
+        changed = idx[self.color[idx] != old_color]
+        return [self.views[i] for i in changed.tolist()]
@@ -0,0 +1,94 @@
+import pygame
+
+from core.fonts import render_text
+
+
+class HudCompositor:
+    def __init__(self, size):
+        """
+        Composites HUD widgets into one transparent surface, re-rendering a
+        widget only when its value changes
+        Arguments:
+            size: Screen size
+        """
+        self.size = size
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        # name -> (key, rect drawn to on self.surface)
+        self.widgets = {}
+        self.redraws = 0
+        self._frames = {}
+        self._death_screen = None
+        self._results_key = None
+        self._results_screen = None
+
+    def set(self, name, key, draw):
+        """
+        Show a widget, redrawing it only if key differs from last time
+        Arguments:
+            name: Widget name
+            key: Value(s) the widget shows; a changed key means a redraw
+            draw: draw(surface) renders the widget and returns the Rect it drew to
+        """
+        widget = self.widgets.get(name)
+        if widget is not None and widget[0] == key:
+            return
+        if widget is not None:
+            self.surface.fill((0, 0, 0, 0), widget[1])
+        self.widgets[name] = (key, draw(self.surface))
+        self.redraws += 1
+
+    def remove(self, name):
+        """Hide a widget"""
+        widget = self.widgets.pop(name, None)
+        if widget is not None:
+            self.surface.fill((0, 0, 0, 0), widget[1])
+
+    def render(self, queue, layer="hud"):
+        """Submit the composited HUD, cut to the widget rects so empty areas cost nothing"""
+        for _, rect in self.widgets.values():
+            queue.submit(layer, self.surface, rect.topleft, rect)
+
+    def get_frame(self, width, height, color=(0, 0, 0), border=2):
+        """A rectangle outline, rendered once per size and color"""
+        key = (width, height, color, border)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(frame, color, (0, 0, width, height), border)
+            self._frames[key] = frame
+        return frame
+
+    def get_death_screen(self):
+        """Darkened overlay with the static death screen text, rendered once"""
+        if self._death_screen is None:
+            width = self.size[0]
+            surf = pygame.Surface(self.size, pygame.SRCALPHA)
+            surf.fill((0, 0, 0, 180))
+            death_text = render_text(120, "YOU DIED", (200, 0, 0))
+            surf.blit(death_text, death_text.get_rect(center=(width // 2, 200)))
+            hint = render_text(28, "Press R to restart", (255, 255, 255))
+            surf.blit(hint, hint.get_rect(center=(width // 2, 380)))
+            self._death_screen = surf
+        return self._death_screen
+
+    def get_results_screen(self, score, rank):
+        """The time-up results screen for a final score and rank, rendered once"""
+        key = (score, rank)
+        if self._results_key != key:
+            surf = pygame.Surface(self.size)
+            surf.fill((0, 0, 0))
+            # Time-up message
+            victory_text = render_text(100, "TIME'S UP!", (0, 255, 0))
+            surf.blit(victory_text, victory_text.get_rect(center=(600, 150)))
+            # Final score
+            score_text = render_text(60, f"FINAL SCORE: {score}", (255, 255, 0))
+            surf.blit(score_text, score_text.get_rect(center=(600, 300)))
+            # Final rank
+            rank_text = render_text(80, rank, (255, 100, 0))
+            surf.blit(rank_text, rank_text.get_rect(center=(600, 450)))
+            # Completion message
+            complete_text = render_text(40, "SUCCESS!", (0, 200, 255))
+            surf.blit(complete_text, complete_text.get_rect(center=(600, 600)))
+            self._results_key = key
+            self._results_screen = surf
+        return self._results_screen
@@ -0,0 +1,75 @@
+import numpy as np
+from systems.soa import StructOfArrays
+
+
+class ParticleSystem(StructOfArrays):
+    FIELDS = (
+        ("pos", float, (2,)),
+        ("vel", float, (2,)),
+        ("angle", float, ()),
+        ("spin", float, ()),
+        ("size", float, ()),
+        ("life", float, ()),
+        ("color", np.int8, ()),
+    )
+
+    def __init__(self, lifetime, size_range, spin_range=(0, 0), speed_range=(100, 200),
+                 capacity=512, seed=None):
+        """
+        Particles stored as struct-of-arrays and advanced in one vectorized step
+        Arguments:
+            lifetime: Seconds each particle lives
+            size_range: (min, max) size/radius of new particles
+            spin_range: (min, max) rotation speed in radians per second
+            speed_range: (min, max) speed in pixels per second
+            capacity: Number of slots allocated up front (doubles when full)
+            seed: Seed for the burst RNG (from the run's RNG so runs replay exactly)
+        """
+        self.lifetime = lifetime
+        self.size_range = size_range
+        self.spin_range = spin_range
+        self.speed_range = speed_range
+        self.rng = np.random.default_rng(seed)
+        super().__init__(capacity)
+
+    def burst(self, pos, color, count):
+        """Spawn count particles at pos flying out in random directions"""
+        start, end = self.count, self.count + count
+        if end > self.capacity:
+            self._grow(end)
+        rng = self.rng
+        heading = rng.uniform(0, 2 * np.pi, count)
+        speed = rng.uniform(*self.speed_range, count)
+        self.pos[start:end] = pos[0], pos[1]
+        self.vel[start:end, 0] = np.cos(heading) * speed
+        self.vel[start:end, 1] = np.sin(heading) * speed
+        self.angle[start:end] = rng.uniform(0, 2 * np.pi, count)
+        self.spin[start:end] = rng.uniform(*self.spin_range, count)
+        self.size[start:end] = rng.uniform(*self.size_range, count)
+        self.life[start:end] = self.lifetime
+        self.color[start:end] = self.color_index(color)
+        self.count = end
+
+    def update(self, delta):
+        """Advance position, spin and lifetime of every particle, then drop expired ones"""
+        n = self.count
+        self.pos[:n] += self.vel[:n] * delta
+        self.angle[:n] += self.spin[:n] * delta
+        self.life[:n] -= delta
+
+        # swap-compaction: live particles from the tail fill the holes left by
+        # expired ones inside the new live range
+        dead = self.life[:n] <= 0
+        live = n - int(dead.sum())
+        if live == n:
+            return
+        holes = np.flatnonzero(dead[:live])
+        movers = np.flatnonzero(~dead[live:n]) + live
+        for arr in self._arrays():
+            arr[holes] = arr[movers]
+        self.count = live
+
+    def alphas(self):
+        """Opacity of each live particle, fading out over its lifetime (95% max)"""
+        n = self.count
+        return (255 * 0.95 * np.minimum(1, self.life[:n] / self.lifetime)).astype(int)
@@ -1,15 +1,19 @@
 import pygame
 import math
+from core.fonts import get_font, text_cache
 
 class PowerBar():
     def __init__(self):
         self.power = 0
         self.color = (255, 0, 0)
         self.border_margin = 2
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
         self.power_level = 1
         self.phantom_power = 0 # To add smooth border
         self.power_multiplier = 1.0
+        # pre-rendered bar pieces for the current color and size
+        self._strip_key = None
+        self._strip_cache = None
 
     def Update(self, delta):
         if self.phantom_power != self.power:
@@ -39,31 +43,46 @@ class PowerBar():
     def get_power_multiplier(self):
         return self.power_multiplier
 
-    def render(self, screen, left_top, size):
-        # Draw background bar with 95% opacity
-        bg_surf = pygame.Surface((int(size.x), int(size.y)), pygame.SRCALPHA)
-        pygame.draw.rect(bg_surf, (*self.color, int(255 * 0.95)), 
-                         (0, 0, int(size.x), int(size.y)))
-        screen.blit(bg_surf, (int(left_top.x), int(left_top.y)))
-        
+    def _strips(self, width, height):
+        """Background, colored and black strips for a bar size, rendered once per color"""
+        key = (self.color, width, height)
+        if self._strip_key != key:
+            inner = (width - self.border_margin * 2, height - self.border_margin * 2)
+            # 95% opacity
+            bg = pygame.Surface((width, height), pygame.SRCALPHA)
+            bg.fill((*self.color, int(255 * 0.95)))
+            color_strip = pygame.Surface(inner, pygame.SRCALPHA)
+            color_strip.fill((*self.color, int(255 * 0.95)))
+            black_strip = pygame.Surface(inner, pygame.SRCALPHA)
+            black_strip.fill((0, 0, 0, 242))
+            self._strip_cache = (bg, color_strip, black_strip)
+            self._strip_key = key
+        return self._strip_cache
+
+    def _box_widths(self, size):
         full_box_width = size.x - self.border_margin * 2
         color_box_percent = self.phantom_power / 100
-        color_box_width = int(color_box_percent * full_box_width)
-        black_box_width = int((1 - color_box_percent) * full_box_width)
+        return int(color_box_percent * full_box_width), int((1 - color_box_percent) * full_box_width)
 
-        # Draw colored portion with 95% opacity
-        color_surf = pygame.Surface((int(color_box_width), int(size.y - self.border_margin * 2)), pygame.SRCALPHA)
-        pygame.draw.rect(color_surf, (*self.color, int(255 * 0.95)), 
-                         (0, 0, color_box_width, size.y - self.border_margin * 2))
-        screen.blit(color_surf, (int(left_top.x) + self.border_margin, int(left_top.y) + self.border_margin))
-        
-        # Draw black portion with 95% opacity
-        black_surf = pygame.Surface((int(black_box_width), int(size.y - self.border_margin * 2)), pygame.SRCALPHA)
-        pygame.draw.rect(black_surf, (0, 0, 0, int(242)), 
-                         (0, 0, black_box_width, size.y - self.border_margin * 2))
-        screen.blit(black_surf, (int(left_top.x) + self.border_margin + color_box_width, int(left_top.y) + self.border_margin))
+    def get_render_key(self, size):
+        """Everything render depends on; the bar only needs redrawing when this changes"""
+        return (self.color, self._box_widths(size), math.ceil(self.power))
+
+    def render(self, screen, left_top, size):
+        """Draw the bar; returns the Rect drawn to"""
+        x, y = int(left_top.x), int(left_top.y)
+        bg, color_strip, black_strip = self._strips(int(size.x), int(size.y))
+        color_box_width, black_box_width = self._box_widths(size)
+        inner_height = color_strip.get_height()
+        screen.blit(bg, (x, y))
+        # colored portion, then black portion, cut from the full-width strips
+        screen.blit(color_strip, (x + self.border_margin, y + self.border_margin),
+                    (0, 0, color_box_width, inner_height))
+        screen.blit(black_strip, (x + self.border_margin + color_box_width, y + self.border_margin),
+                    (0, 0, black_box_width, inner_height))
         
-        power_text = self.font.render(f"{math.ceil(self.power)}%", True, (255, 255, 255))
+        power_text = text_cache.get(self.font, f"{math.ceil(self.power)}%", (255, 255, 255))
         text_rect = power_text.get_rect()
         text_rect.center = ((left_top.x * 2 + size.x) / 2, (left_top.y * 2 + size.y) / 2)
-        screen.blit(power_text, text_rect)
\ No newline at end of file
+        screen.blit(power_text, text_rect)
+        return pygame.Rect(x, y, int(size.x), int(size.y)).union(text_rect)
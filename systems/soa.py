@@ -0,0 +1,49 @@
+import numpy as np
+import systems.color_system
+
+
+class StructOfArrays:
+    # per-item state kept in arrays, as (name, dtype, trailing shape)
+    FIELDS = ()
+
+    def __init__(self, capacity):
+        """
+        Base for pools that keep per-item state in parallel NumPy arrays, one
+        per entry in FIELDS. Live items are packed into slots [0, count).
+        Arguments:
+            capacity: Number of slots allocated up front (doubles when full)
+        """
+        self.capacity = capacity
+        for name, dtype, shape in self.FIELDS:
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self.count = 0
+        # colors are stored as indices into this palette
+        self.palette = list(systems.color_system.COLORS)
+
+    def _arrays(self):
+        return tuple(getattr(self, name) for name, _, _ in self.FIELDS)
+
+    def _grow(self, needed=None):
+        """Double the capacity of every array until needed slots fit (once if None), keeping live items"""
+        capacity = self.capacity * 2
+        while needed is not None and capacity < needed:
+            capacity *= 2
+        for name, dtype, shape in self.FIELDS:
+            grown = np.zeros((capacity,) + shape, dtype=dtype)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+    def color_index(self, color):
+        """Get the palette index of an RGB color, adding it to the palette if new"""
+        color = tuple(color)
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def color_at(self, i):
+        """Get the RGB color of the item in slot i"""
+        return self.palette[self.color[i]]
+
+    def __len__(self):
+        return self.count